@@ -1,12 +1,12 @@
 import logging
 from abc import ABC, abstractmethod
-from typing import Union, Set, Callable, Iterable, Optional
+from typing import Union, Set, Callable, Iterable, Optional, Dict
 
 import numpy as np
 import pandas as pd
-from scipy.spatial import distance_matrix
 
 from ..util.cache import PickleLoadSaveMixin
+from ..util.pickle import setstate, getstate
 
 log = logging.getLogger(__name__)
 
@@ -36,6 +36,16 @@ class EuclideanClusterer(PickleLoadSaveMixin, ABC):
 
         self._clusterDict = {}
         self._numClusters: Optional[int] = None
+        # datapoints sorted by cluster label, such that each cluster is a contiguous block (see _get_cluster_slices)
+        self._sortedDatapoints: Optional[np.ndarray] = None
+        self._clusterSlices: Optional[Dict[int, slice]] = None
+
+    def __getstate__(self):
+        # the sorted datapoints are a (derived) copy of the datapoints and are thus recomputed rather than persisted
+        return getstate(EuclideanClusterer, self, transient_properties=["_sortedDatapoints", "_clusterSlices"])
+
+    def __setstate__(self, state):
+        setstate(EuclideanClusterer, self, state, new_optional_properties=["_sortedDatapoints", "_clusterSlices"])
 
     class Cluster:
         def __init__(self, datapoints: np.ndarray, identifier: Union[int, str]):
@@ -51,7 +61,9 @@ class EuclideanClusterer(PickleLoadSaveMixin, ABC):
             return f"{self.__class__.__name__}_{self.identifier}"
 
         def _compute_radius(self):
-            return np.max(distance_matrix([self.centroid()], self.datapoints))
+            # the maximum of the squared distances determines the maximum distance, so only a single root is required
+            differences = self.datapoints - self.centroid()
+            return np.sqrt(np.max(np.einsum("ij,ij->i", differences, differences)))
 
         def _compute_centroid(self):
             return np.mean(self.datapoints, axis=0)
@@ -125,6 +137,9 @@ class EuclideanClusterer(PickleLoadSaveMixin, ABC):
         self._datapoints = data
         self._clusterIdentifiers = set(labels)
         self._labels = labels
+        self._clusterDict = {}
+        self._sortedDatapoints = None
+        self._clusterSlices = None
         if self.noiseLabel is not None:
             self._nonNoiseClusterIdentifiers = self._clusterIdentifiers.difference({self.noiseLabel})
         log.info(f"{self} found {self.num_clusters} clusters")
@@ -151,14 +166,29 @@ class EuclideanClusterer(PickleLoadSaveMixin, ABC):
     # unfortunately, there seems to be no way to annotate the return type correctly
     # https://github.com/python/mypy/issues/3993
     def get_cluster(self, cluster_id: int) -> Cluster:
-        if cluster_id not in self.labels:
-            raise KeyError(f"no cluster for id {cluster_id}")
         result = self._clusterDict.get(cluster_id)
         if result is None:
-            result = self.Cluster(self.datapoints[self.labels == cluster_id], identifier=cluster_id)
+            cluster_slice = self._get_cluster_slices().get(cluster_id)
+            if cluster_slice is None:
+                raise KeyError(f"no cluster for id {cluster_id}")
+            result = self.Cluster(self._sortedDatapoints[cluster_slice], identifier=cluster_id)
             self._clusterDict[cluster_id] = result
         return result
 
+    def _get_cluster_slices(self) -> Dict[int, slice]:
+        """
+        :return: a mapping from cluster identifiers to the slices of the datapoints sorted by label, which contain
+            the respective cluster's datapoints (in their original order)
+        """
+        if self._clusterSlices is None:
+            # sort the datapoints once, such that the datapoints of clusters are views instead of (masked) copies
+            order = np.argsort(self.labels, kind="stable")
+            self._sortedDatapoints = self.datapoints[order]
+            unique_labels, start_indices, counts = np.unique(self.labels[order], return_index=True, return_counts=True)
+            self._clusterSlices = {label: slice(start, start + count)
+                for label, start, count in zip(unique_labels, start_indices, counts)}
+        return self._clusterSlices
+
     @property
     def num_clusters(self) -> int:
         return len(self._nonNoiseClusterIdentifiers)
@@ -89,20 +89,21 @@ class IndexCachedColumnGenerator(ColumnGenerator):
         self.cache = cache
 
     def _generate_column(self, df: pd.DataFrame) -> pd.Series:
-        # compute series of cached values
-        cache_values = [self.cache.get(nt.Index) for nt in df.itertuples()]
-        cache_series = pd.Series(cache_values, dtype=object, index=df.index).dropna()
+        # compute series of cached values (iterating over the index only, without constructing row tuples)
+        cache_values = self.cache.get_many(df.index)
+        cache_series = pd.Series(cache_values, dtype=object, index=df.index)
+        is_missing = cache_series.isna().values
+        cache_series = cache_series[~is_missing]
 
         # compute missing values (if any) via wrapped generator, storing them in the cache
-        missing_values_df = df[~df.index.isin(cache_series.index)]
+        missing_values_df = df[is_missing]
         self.log.info(f"Retrieved {len(cache_series)} values from the cache, {len(missing_values_df)} still to be computed by "
                       f"{self.columnGenerator}")
         if len(missing_values_df) == 0:
             return cache_series
         else:
             missing_series = self.columnGenerator.generate_column(missing_values_df)
-            for key, value in missing_series.iteritems():
-                self.cache.set(key, value)
+            self.cache.set_many(missing_series.items())
             return pd.concat((cache_series, missing_series))
 
 
@@ -126,29 +127,24 @@ class ColumnGeneratorCachedByIndex(ColumnGenerator, ABC):
 
     def _generate_column(self, df: pd.DataFrame) -> Union[pd.Series, list, np.ndarray]:
         self.log.info(f"Generating column {self.generatedColumnName} with {self.__class__.__name__}")
-        values = []
-        cache_hits = 0
+        if self.cache is None:
+            return self._generate_values(df)
+        values = self.cache.get_many(df.index)
+        missing_positions = [i for i, value in enumerate(values) if value is None]
+        num_missing = len(missing_positions)
+        # precompute the iterations at which progress is to be logged (in steps of 5%)
+        log_percentage_at_iteration = {-(-percentage * num_missing // 100): percentage for percentage in range(0, 100, 5)}
+        new_items = []
+        for i, (position, namedTuple) in enumerate(zip(missing_positions, df.iloc[missing_positions].itertuples())):
+            if i in log_percentage_at_iteration:
+                self.log.debug(f"Generated {log_percentage_at_iteration[i]}% of missing values of {self.generatedColumnName}")
+            value = self._generate_value(namedTuple)
+            values[position] = value
+            new_items.append((namedTuple.Index, value))
+        if len(new_items) > 0:
+            self.cache.set_many(new_items)
         column_length = len(df)
-        percentage_to_log = 0
-        for i, namedTuple in enumerate(df.itertuples()):
-            percentage_generated = int(100*i/column_length)
-            if percentage_generated == percentage_to_log:
-                self.log.debug(f"Processed {percentage_to_log}% of {self.generatedColumnName}")
-                percentage_to_log += 5
-
-            key = namedTuple.Index
-            if self.cache is not None:
-                value = self.cache.get(key)
-                if value is None:
-                    value = self._generate_value(namedTuple)
-                    self.cache.set(key, value)
-                else:
-                    cache_hits += 1
-            else:
-                value = self._generate_value(namedTuple)
-            values.append(value)
-        if self.cache is not None:
-            self.log.info(f"Cached column generation resulted in {cache_hits}/{column_length} cache hits")
+        self.log.info(f"Cached column generation resulted in {column_length - num_missing}/{column_length} cache hits")
         return values
 
     def __getstate__(self):
@@ -161,3 +157,14 @@ class ColumnGeneratorCachedByIndex(ColumnGenerator, ABC):
     @abstractmethod
     def _generate_value(self, named_tuple) -> Any:
         pass
+
+    def _generate_values(self, df: pd.DataFrame) -> Union[pd.Series, list, np.ndarray]:
+        """
+        Generates the values for all rows of the given data frame at once; used if caching is disabled.
+        The default implementation calls _generate_value for each row. Subclasses which can compute the values in a
+        vectorised manner should override this method.
+
+        :param df: the input data frame
+        :return: a list/array of the same length as df or a series with the same index
+        """
+        return [self._generate_value(nt) for nt in df.itertuples()]
@@ -1,13 +1,13 @@
 import logging
 import random
 from abc import ABC, abstractmethod
-from typing import Tuple, Sequence, TypeVar, Generic
+from typing import Tuple, Sequence, TypeVar, Generic, Optional
 
 import numpy as np
 import pandas as pd
-import scipy.stats
 from sklearn.model_selection import StratifiedShuffleSplit
 
+from .util.pickle import getstate, setstate
 from .util.string import ToStringMixin
 
 log = logging.getLogger(__name__)
@@ -43,14 +43,23 @@ class InputOutputArrays(BaseInputOutputData[np.ndarray]):
         outputs = self.outputs[indices]
         return InputOutputArrays(inputs, outputs)
 
-    def to_torch_data_loader(self, batch_size=64, shuffle=True):
+    def to_torch_data_loader(self, batch_size=64, shuffle=True, pin_memory=False):
+        """
+        :param batch_size: the batch size
+        :param shuffle: whether to shuffle the data
+        :param pin_memory: whether the data loader shall copy tensors into pinned memory, which speeds up subsequent
+            transfers to the GPU
+        :return: a torch data loader for the data, whose tensors share memory with the arrays (no copy is made if the
+            arrays are C-contiguous)
+        """
         try:
             import torch
             from torch.utils.data import DataLoader, TensorDataset
         except ImportError:
             raise ImportError(f"Could not import torch, did you install it?")
-        dataset = TensorDataset(torch.tensor(self.inputs), torch.tensor(self.outputs))
-        return DataLoader(dataset, batch_size=batch_size, shuffle=shuffle)
+        dataset = TensorDataset(torch.from_numpy(np.ascontiguousarray(self.inputs)),
+            torch.from_numpy(np.ascontiguousarray(self.outputs)))
+        return DataLoader(dataset, batch_size=batch_size, shuffle=shuffle, pin_memory=pin_memory)
 
 
 class InputOutputData(BaseInputOutputData[pd.DataFrame], ToStringMixin):
@@ -59,6 +68,14 @@ class InputOutputData(BaseInputOutputData[pd.DataFrame], ToStringMixin):
     """
     def __init__(self, inputs: pd.DataFrame, outputs: pd.DataFrame):
         super().__init__(inputs, outputs)
+        # cached standardised arrays for correlation computations: (inputs, outputs, standardised inputs, standardised outputs)
+        self._standardisedArrays: Optional[Tuple[pd.DataFrame, pd.DataFrame, np.ndarray, np.ndarray]] = None
+
+    def __getstate__(self):
+        return getstate(InputOutputData, self, transient_properties=["_standardisedArrays"])
+
+    def __setstate__(self, state):
+        setstate(InputOutputData, self, state, new_optional_properties=["_standardisedArrays"])
 
     def _tostring_object_info(self) -> str:
         return f"N={len(self.inputs)}, numInputColumns={len(self.inputs.columns)}, numOutputColumns={len(self.outputs.columns)}"
@@ -75,6 +92,9 @@ class InputOutputData(BaseInputOutputData[pd.DataFrame], ToStringMixin):
         return cls(inputs, outputs)
 
     def filter_indices(self, indices: Sequence[int]) -> __qualname__:
+        # convert the indices only once (rather than letting pandas convert them for each data frame)
+        if not isinstance(indices, np.ndarray):
+            indices = np.asarray(indices, dtype=np.intp)
         inputs = self.inputs.iloc[indices]
         outputs = self.outputs.iloc[indices]
         return InputOutputData(inputs, outputs)
@@ -92,16 +112,43 @@ class InputOutputData(BaseInputOutputData[pd.DataFrame], ToStringMixin):
     def output_dim(self):
         return self.outputs.shape[1]
 
-    def compute_input_output_correlation(self):
-        correlations = {}
-        for outputCol in self.outputs.columns:
-            correlations[outputCol] = {}
-            output_series = self.outputs[outputCol]
-            for inputCol in self.inputs.columns:
-                input_series = self.inputs[inputCol]
-                pcc, pvalue = scipy.stats.pearsonr(input_series, output_series)
-                correlations[outputCol][inputCol] = pcc
-        return correlations
+    def compute_input_output_correlation(self, cache: bool = False):
+        """
+        Computes the Pearson correlation coefficients between all pairs of input and output columns.
+
+        :param cache: whether to retain the standardised (float64) copies of the data in this object, such that subsequent
+            calls need not recompute them (as long as the inputs and outputs are not replaced; in-place modifications of
+            the data frames are not detected). The copies are retained until :meth:`clear_correlation_cache` is called.
+        :return: a nested dictionary mapping each output column name to a dictionary mapping input column names to
+            correlation coefficients
+        """
+        cached = self._standardisedArrays
+        if cached is not None and cached[0] is self.inputs and cached[1] is self.outputs:
+            x_standardised, y_standardised = cached[2], cached[3]
+        else:
+            x_standardised = self._standardised_array(self.inputs)
+            y_standardised = self._standardised_array(self.outputs)
+            self._standardisedArrays = (self.inputs, self.outputs, x_standardised, y_standardised) if cache else None
+        # compute all coefficients at once via a single product of the standardised data matrices
+        correlations = np.clip(x_standardised.T @ y_standardised / len(x_standardised), -1.0, 1.0)
+        return pd.DataFrame(correlations, index=self.inputs.columns, columns=self.outputs.columns).to_dict()
+
+    def clear_correlation_cache(self):
+        """
+        Releases the standardised data retained by :meth:`compute_input_output_correlation` (if called with cache=True)
+        """
+        self._standardisedArrays = None
+
+    @staticmethod
+    def _standardised_array(df: pd.DataFrame) -> np.ndarray:
+        a = df.to_numpy(dtype=np.float64, copy=True)
+        mean = a.mean(axis=0)
+        std = a.std(axis=0)
+        # standardise in-place, avoiding the allocation of temporary arrays
+        a -= mean
+        with np.errstate(divide="ignore", invalid="ignore"):  # constant columns result in NaN coefficients
+            a /= std
+        return a
 
 
 TInputOutputData = TypeVar("TInputOutputData", bound=BaseInputOutputData)
@@ -128,11 +175,11 @@ class DataSplitterFractional(DataSplitter):
             rand = np.random.RandomState(self.randomSeed)
             indices = rand.permutation(num_data_points)
         else:
-            indices = range(num_data_points)
+            indices = np.arange(num_data_points)
         indices_a = indices[:split_index]
         indices_b = indices[split_index:]
-        a = data.filter_indices(list(indices_a))
-        b = data.filter_indices(list(indices_b))
+        a = data.filter_indices(indices_a)
+        b = data.filter_indices(indices_b)
         return (indices_a, indices_b), (a, b)
 
     def split(self, data: TInputOutputData) -> Tuple[TInputOutputData, TInputOutputData]:
@@ -218,7 +265,7 @@ class DataFrameSplitterFractional(DataFrameSplitter):
             rand = np.random.RandomState(self.randomSeed)
             indices = rand.permutation(n)
         else:
-            indices = list(range(n))
+            indices = np.arange(n)
         indices_a = indices[:size_a]
         indices_b = indices[size_a:]
         return indices_a, indices_b
@@ -255,13 +302,9 @@ class DataFrameSplitterColumnEquivalenceClass(DataFrameSplitter):
             rng.shuffle(values)
 
         num_items_in_first_set = round(fractional_size_of_first_set * len(values))
-        first_set_values = set(values[:num_items_in_first_set])
-
-        first_set_indices = []
-        second_set_indices = []
-        for i, t in enumerate(df.itertuples()):
-            if getattr(t, self.column) in first_set_values:
-                first_set_indices.append(i)
-            else:
-                second_set_indices.append(i)
+        first_set_values = values[:num_items_in_first_set]
+
+        is_in_first_set = df[self.column].isin(first_set_values).values
+        first_set_indices = np.flatnonzero(is_in_first_set)
+        second_set_indices = np.flatnonzero(~is_in_first_set)
         return first_set_indices, second_set_indices
\ No newline at end of file
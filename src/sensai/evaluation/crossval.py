@@ -1,7 +1,9 @@
+import contextlib
 import copy
 import functools
 import logging
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
 from typing import Tuple, Any, Generator, Generic, TypeVar, List, Union, Sequence, Optional
 
 import numpy as np
@@ -15,6 +17,7 @@ from .evaluator import VectorRegressionModelEvaluationData, VectorClassification
     RegressionEvaluatorParams, MetricsDictProviderFromFunction
 from ..data import InputOutputData, DataSplitterFractional
 from ..tracking.tracking_base import TrackingContext
+from ..util.pickle import setstate
 from ..util.typing import PandasNamedTuple
 from ..vector_model import VectorClassificationModel, VectorRegressionModel, VectorModel
 
@@ -130,7 +133,8 @@ class VectorModelCrossValidatorParams:
             return_trained_models=False,
             evaluator_params: Union[RegressionEvaluatorParams, ClassificationEvaluatorParams] = None,
             default_splitter_random_seed=42,
-            default_splitter_shuffle=True):
+            default_splitter_shuffle=True,
+            num_processes: int = 1):
         """
         :param folds: the number of folds
         :param splitter: the splitter to use in order to generate the folds; if None, use default split (using parameters for random seed
@@ -140,14 +144,28 @@ class VectorModelCrossValidatorParams:
         :param evaluator_params: the model evaluator parameters
         :param default_splitter_random_seed: [if splitter is None] the random seed to use for splits
         :param default_splitter_shuffle: [if splitter is None] whether to shuffle the data (using randomSeed) before creating the folds
+        :param num_processes: the number of parallel processes in which to train and evaluate the models for the individual folds
+            (use 1 to process folds sequentially in the current process). If greater than 1, the model must be picklable, and the
+            model that is passed to evalModel is not fitted itself (each process fits its own copy)
         """
         self.folds = folds
+        self.numProcesses = num_processes
         self.evaluatorParams = evaluator_params
         self.returnTrainedModels = return_trained_models
         if splitter is None:
             splitter = CrossValidationSplitterDefault(shuffle=default_splitter_shuffle, random_seed=default_splitter_random_seed)
         self.splitter = splitter
 
+    def __setstate__(self, state):
+        setstate(VectorModelCrossValidatorParams, self, state, new_default_properties={"numProcesses": 1})
+
+
+def _fit_and_evaluate_fold(evaluator: VectorModelEvaluator, model: VectorModel, fold_number: int, num_folds: int) \
+        -> Tuple[VectorModel, VectorModelEvaluationData]:
+    log.info(f"Training and evaluating model with fold {fold_number}/{num_folds} ...")
+    evaluator.fit_model(model)
+    return model, evaluator.eval_model(model)
+
 
 class VectorModelCrossValidator(MetricsDictProvider, Generic[TCrossValData], ABC):
     def __init__(self, data: InputOutputData, params: Union[VectorModelCrossValidatorParams]):
@@ -160,6 +178,17 @@ class VectorModelCrossValidator(MetricsDictProvider, Generic[TCrossValData], ABC
         for trainIndices, testIndices in self.params.splitter.create_folds(data, self.params.folds):
             self.modelEvaluators.append(self._create_model_evaluator(data.filter_indices(trainIndices), data.filter_indices(testIndices)))
 
+    def set_input_preprocessor_sharing(self, enabled: bool):
+        """
+        Enables or disables, for each fold, the sharing of fitted input preprocessors between the models being evaluated
+        (see :meth:`VectorModelEvaluator.set_input_preprocessor_sharing`).
+        Note that sharing is not possible across parallel processes.
+
+        :param enabled: whether to enable the sharing
+        """
+        for evaluator in self.modelEvaluators:
+            evaluator.set_input_preprocessor_sharing(enabled)
+
     @staticmethod
     def for_model(model: VectorModel, data: InputOutputData, params: VectorModelCrossValidatorParams) \
             -> Union["VectorClassificationModelCrossValidator", "VectorRegressionModelCrossValidator"]:
@@ -187,21 +216,27 @@ class VectorModelCrossValidator(MetricsDictProvider, Generic[TCrossValData], ABC
         test_indices_list = []
         predicted_var_names = None
         with self.begin_optional_tracking_context_for_model(model, track=track) as tracking_context:
-            for i, evaluator in enumerate(self.modelEvaluators, start=1):
-                evaluator: VectorModelEvaluator
-                log.info(f"Training and evaluating model with fold {i}/{len(self.modelEvaluators)} ...")
-                model_to_fit: VectorModel = copy.deepcopy(model) if self.params.returnTrainedModels else model
-                evaluator.fit_model(model_to_fit)
-                eval_data = evaluator.eval_model(model_to_fit)
-                if predicted_var_names is None:
-                    predicted_var_names = eval_data.predicted_var_names
-                if self.params.returnTrainedModels:
-                    trained_models.append(model_to_fit)
-                for predictedVarName in predicted_var_names:
-                    log.info(f"Evaluation result for {predictedVarName}, fold {i}/{len(self.modelEvaluators)}: "
-                             f"{eval_data.get_eval_stats(predicted_var_name=predictedVarName)}")
-                eval_data_list.append(eval_data)
-                test_indices_list.append(evaluator.test_data.outputs.index)
+            num_folds = len(self.modelEvaluators)
+            parallel = self.params.numProcesses != 1
+            with ProcessPoolExecutor(max_workers=self.params.numProcesses) if parallel else contextlib.nullcontext() as executor:
+                if executor is None:
+                    fold_results = (_fit_and_evaluate_fold(evaluator,
+                        copy.deepcopy(model) if self.params.returnTrainedModels else model, i, num_folds)
+                        for i, evaluator in enumerate(self.modelEvaluators, start=1))
+                else:
+                    futures = [executor.submit(_fit_and_evaluate_fold, evaluator, model, i, num_folds)
+                        for i, evaluator in enumerate(self.modelEvaluators, start=1)]
+                    fold_results = (future.result() for future in futures)
+                for i, (evaluator, (model_to_fit, eval_data)) in enumerate(zip(self.modelEvaluators, fold_results), start=1):
+                    if predicted_var_names is None:
+                        predicted_var_names = eval_data.predicted_var_names
+                    if self.params.returnTrainedModels:
+                        trained_models.append(model_to_fit)
+                    for predictedVarName in predicted_var_names:
+                        log.info(f"Evaluation result for {predictedVarName}, fold {i}/{len(self.modelEvaluators)}: "
+                                 f"{eval_data.get_eval_stats(predicted_var_name=predictedVarName)}")
+                    eval_data_list.append(eval_data)
+                    test_indices_list.append(evaluator.test_data.outputs.index)
             crossval_data = self._create_result_data(trained_models, eval_data_list, test_indices_list, predicted_var_names)
             if tracking_context.is_enabled():
                 crossval_data.track_metrics(tracking_context)
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import Generic, TypeVar, List, Union, Dict, Sequence, Optional, Tuple, Callable
 
 import numpy as np
@@ -6,6 +7,7 @@ import pandas as pd
 from matplotlib import pyplot as plt
 
 from ...util.plot import ScatterPlot, HistogramPlot, Plot, HeatMapPlot
+from ...util.pickle import setstate, getstate
 from ...util.string import ToStringMixin, dict_string
 from ...vector_model import VectorModel
 
@@ -20,6 +22,10 @@ TVectorModel = TypeVar("TVectorModel", bound=VectorModel)
 
 PredictionArray = Union[np.ndarray, pd.Series, pd.DataFrame, list]
 
+# numpy reduction functions which support the `axis` argument and can thus be applied to all metrics of a collection at once
+_AXIS_AGG_FNS = {np.mean, np.std, np.var, np.median, np.min, np.max, np.sum, np.nanmean, np.nanstd, np.nanvar, np.nanmedian,
+    np.nanmin, np.nanmax}
+
 
 class EvalStats(Generic[TMetric], ToStringMixin):
     def __init__(self, metrics: List[TMetric], additional_metrics: List[TMetric] = None):
@@ -31,22 +37,39 @@ class EvalStats(Generic[TMetric], ToStringMixin):
         if additional_metrics is not None:
             self.metrics = self.metrics + additional_metrics
         self.name = None
+        self._metricsDict: Optional[Dict[str, float]] = None
+
+    def __setstate__(self, state):
+        setstate(EvalStats, self, state, new_optional_properties=["_metricsDict"])
 
     def set_name(self, name: str):
         self.name = name
 
     def add_metric(self, metric: TMetric):
         self.metrics.append(metric)
+        self.clear_cache()
+
+    def clear_cache(self):
+        """
+        Clears the cached metric values, such that they are recomputed upon the next request.
+        This is done automatically whenever metrics or data are added.
+        """
+        self._metricsDict = None
 
     def compute_metric_value(self, metric: TMetric) -> float:
         return metric.compute_value_for_eval_stats(self)
 
     def metrics_dict(self) -> Dict[str, float]:
         """
-        Computes all metrics
+        Computes all metrics (or retrieves them from the cache if they have been computed before)
 
         :return: a dictionary mapping metric names to values
         """
+        if self._metricsDict is None:
+            self._metricsDict = self._compute_metrics_dict()
+        return dict(self._metricsDict)
+
+    def _compute_metrics_dict(self) -> Dict[str, float]:
         d = {}
         for metric in self.metrics:
             d[metric.name] = self.compute_metric_value(metric)
@@ -93,12 +116,22 @@ class Metric(Generic[TEvalStats], ABC):
 
 
 class EvalStatsCollection(Generic[TEvalStats, TMetric], ABC):
-    def __init__(self, eval_stats_list: List[TEvalStats]):
+    def __init__(self, eval_stats_list: List[TEvalStats], num_threads: int = 1):
+        """
+        :param eval_stats_list: the evaluation stats objects to collect
+        :param num_threads: the number of threads with which to compute the metrics of the evaluation stats objects concurrently
+            (use 1 to compute them sequentially); since the metric computations are largely numpy/scikit-learn operations,
+            which release the GIL, threads suffice for a speed-up
+        """
         self.statsList = eval_stats_list
+        if num_threads == 1 or len(eval_stats_list) <= 1:
+            all_metrics = [es.metrics_dict() for es in eval_stats_list]
+        else:
+            with ThreadPoolExecutor(max_workers=num_threads) as executor:
+                all_metrics = list(executor.map(lambda es: es.metrics_dict(), eval_stats_list))
         metric_names_set = None
         metrics_list = []
-        for es in eval_stats_list:
-            metrics = es.metrics_dict()
+        for metrics in all_metrics:
             current_metric_names_set = set(metrics.keys())
             if metric_names_set is None:
                 metric_names_set = current_metric_names_set
@@ -110,6 +143,20 @@ class EvalStatsCollection(Generic[TEvalStats, TMetric], ABC):
         metric_names = sorted(metrics_list[0].keys())
         self._valuesByMetricName = {metric: [d[metric] for d in metrics_list] for metric in metric_names}
         self._metrics: List[TMetric] = eval_stats_list[0].metrics
+        self._valuesMatrix: Optional[np.ndarray] = None
+
+    def __setstate__(self, state):
+        setstate(EvalStatsCollection, self, state, new_optional_properties=["_valuesMatrix"])
+
+    def _get_values_matrix(self) -> np.ndarray:
+        """
+        :return: an array of shape (number of evaluation stats objects, number of metrics) containing all metric values, where the
+            order of metrics (columns) is the one of `_valuesByMetricName`
+        """
+        if self._valuesMatrix is None:
+            # each metric's values are contiguous (the transposed matrix is in row-major order)
+            self._valuesMatrix = np.array(list(self._valuesByMetricName.values()), dtype=float).T
+        return self._valuesMatrix
 
     def get_values(self, metric_name: str):
         return self._valuesByMetricName[metric_name]
@@ -132,15 +179,21 @@ class EvalStatsCollection(Generic[TEvalStats, TMetric], ABC):
         return metric in self._valuesByMetricName
 
     def agg_metrics_dict(self, agg_fns=(np.mean, np.std)) -> Dict[str, float]:
+        """
+        :param agg_fns: the aggregation functions to apply to the list of values of each metric
+        :return: a dictionary mapping "<aggregation function name>[<metric name>]" to the aggregated value
+        """
+        # numpy reductions are applied to all metrics at once (along the axis of the values matrix), other functions per metric
+        agg_values_by_fn = {agg_fn: agg_fn(self._get_values_matrix(), axis=0) for agg_fn in agg_fns if agg_fn in _AXIS_AGG_FNS}
         agg = {}
-        for metric, values in self._valuesByMetricName.items():
+        for i, (metric, values) in enumerate(self._valuesByMetricName.items()):
             for agg_fn in agg_fns:
-                agg[f"{agg_fn.__name__}[{metric}]"] = float(agg_fn(values))
+                agg_values = agg_values_by_fn.get(agg_fn)
+                agg[f"{agg_fn.__name__}[{metric}]"] = float(agg_values[i] if agg_values is not None else agg_fn(values))
         return agg
 
     def mean_metrics_dict(self) -> Dict[str, float]:
-        metrics = {metric: np.mean(values) for (metric, values) in self._valuesByMetricName.items()}
-        return metrics
+        return dict(zip(self._valuesByMetricName, np.mean(self._get_values_matrix(), axis=0)))
 
     def plot_distribution(self, metric_name: str, subtitle: Optional[str] = None, bins=None, kde=False, cdf=False,
             cdf_complementary=False, stat="proportion", **kwargs) -> plt.Figure:
@@ -233,7 +286,30 @@ class EvalStatsCollection(Generic[TEvalStats, TMetric], ABC):
 
     def __str__(self):
         return f"{self.__class__.__name__}[" + \
-               ", ".join([f"{key}={self.agg_metrics_dict()[key]:.4f}" for key in self._valuesByMetricName]) + "]"
+               ", ".join([f"{key}={value:.4f}" for key, value in self.agg_metrics_dict().items()]) + "]"
+
+
+def _is_flat_numeric_array(values) -> bool:
+    return isinstance(values, np.ndarray) and values.ndim == 1 and values.dtype.kind in "iuf"
+
+
+def _values_to_array(values: list) -> Union[list, np.ndarray]:
+    """
+    Converts the given list of values to a numpy array if the conversion can be reverted without loss (via ``list(array)``),
+    i.e. if all values are numpy scalars of the same type; otherwise returns the list unchanged
+
+    :param values: the list of values
+    :return: the numpy array or the original list
+    """
+    if len(values) > 0:
+        value_types = set(map(type, values))
+        if len(value_types) == 1:
+            value_type = next(iter(value_types))
+            if issubclass(value_type, np.generic):
+                array = np.asarray(values)
+                if array.ndim == 1 and array.dtype.kind in "biufcU":
+                    return array
+    return values
 
 
 class PredictionEvalStats(EvalStats[TMetric], ABC):
@@ -254,10 +330,73 @@ class PredictionEvalStats(EvalStats[TMetric], ABC):
         self.y_predicted = []
         self.y_true_multidim = None
         self.y_predicted_multidim = None
+        self._numReleasedValues: Optional[int] = None
+        self._valueArrays: Optional[Tuple[np.ndarray, np.ndarray]] = None
         if y_predicted is not None:
             self.add_all(y_predicted, y_true)
+            # if the values are given as flat numeric arrays, the value arrays can be obtained by copying them directly, which is
+            # much cheaper than converting the lists of values (see get_value_arrays)
+            if _is_flat_numeric_array(y_true) and _is_flat_numeric_array(y_predicted):
+                value_arrays = (np.array(y_true), np.array(y_predicted))
+                for a in value_arrays:
+                    a.setflags(write=False)
+                self._valueArrays = value_arrays
         super().__init__(metrics, additional_metrics=additional_metrics)
 
+    def __getstate__(self):
+        # the values are stored as numpy arrays where possible, because pickling lists of numpy scalars is very slow
+        state = dict(getstate(PredictionEvalStats, self))
+        state["_valueArrays"] = None
+        for name in ("y_true", "y_predicted"):
+            if state[name] is not None:
+                state[name] = _values_to_array(state[name])
+        for name in ("y_true_multidim", "y_predicted_multidim"):
+            if state[name] is not None:
+                state[name] = [_values_to_array(values) for values in state[name]]
+        return state
+
+    def __setstate__(self, state):
+        for name in ("y_true", "y_predicted"):
+            if isinstance(state[name], np.ndarray):
+                state[name] = list(state[name])
+        for name in ("y_true_multidim", "y_predicted_multidim"):
+            if state.get(name) is not None:
+                state[name] = [list(values) if isinstance(values, np.ndarray) else values for values in state[name]]
+        setstate(PredictionEvalStats, self, state, new_optional_properties=["_numReleasedValues", "_valueArrays"])
+
+    def clear_cache(self):
+        super().clear_cache()
+        self._valueArrays = None
+
+    def get_value_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gets the ground truth and predicted values as (read-only) numpy arrays, which are created only once (until further
+        values are added), such that they can be shared by all metrics rather than every metric converting the values
+
+        :return: a pair (y_true, y_predicted)
+        """
+        if self._valueArrays is None:
+            y_true = np.array(self.y_true)
+            y_predicted = np.array(self.y_predicted)
+            y_true.setflags(write=False)
+            y_predicted.setflags(write=False)
+            self._valueArrays = (y_true, y_predicted)
+        return self._valueArrays
+
+    def release_values(self):
+        """
+        Releases the predicted and ground truth values in order to save memory, retaining only the metric values.
+        The metrics are computed (and cached) prior to the release if this has not yet happened; afterwards, no further metrics can be
+        computed and no plots can be created based on this object.
+        """
+        self.metrics_dict()
+        self._numReleasedValues = len(self.y_predicted)
+        self._valueArrays = None
+        self.y_true = None
+        self.y_predicted = None
+        self.y_true_multidim = None
+        self.y_predicted_multidim = None
+
     def add(self, y_predicted, y_true):
         """
         Adds a single pair of values to the evaluation
@@ -267,6 +406,7 @@ class PredictionEvalStats(EvalStats[TMetric], ABC):
         """
         self.y_true.append(y_true)
         self.y_predicted.append(y_predicted)
+        self.clear_cache()
 
     def add_all(self, y_predicted: PredictionArray, y_true: PredictionArray):
         """
@@ -277,6 +417,8 @@ class PredictionEvalStats(EvalStats[TMetric], ABC):
         def is_sequence(x):
             return isinstance(x, pd.Series) or isinstance(x, list) or isinstance(x, np.ndarray)
 
+        self.clear_cache()
+
         if is_sequence(y_predicted) and is_sequence(y_true):
             a, b = len(y_predicted), len(y_true)
             if a != b:
@@ -314,7 +456,8 @@ class PredictionEvalStats(EvalStats[TMetric], ABC):
             raise Exception(f"Unhandled data types: {type(y_predicted)}, {type(y_true)}")
 
     def _tostring_object_info(self) -> str:
-        return f"{super()._tostring_object_info()}, N={len(self.y_predicted)}"
+        num_values = len(self.y_predicted) if self.y_predicted is not None else self._numReleasedValues
+        return f"{super()._tostring_object_info()}, N={num_values}"
 
 
 def mean_stats(eval_stats_list: Sequence[EvalStats]) -> Dict[str, float]:
@@ -5,14 +5,13 @@ from typing import List, Sequence, Optional, Dict, Any, Tuple
 import matplotlib.ticker as plticker
 import numpy as np
 import pandas as pd
+import scipy.sparse
 import sklearn
 from matplotlib import pyplot as plt
-from sklearn.metrics import confusion_matrix, accuracy_score, precision_score, recall_score, precision_recall_curve, \
-    balanced_accuracy_score, f1_score
+from sklearn.metrics import precision_recall_curve
 
 from .eval_stats_base import PredictionArray, PredictionEvalStats, EvalStatsCollection, Metric, EvalStatsPlot, TMetric
-from ...util.aggregation import RelativeFrequencyCounter
-from ...util.pickle import getstate
+from ...util.pickle import getstate, setstate
 from ...util.plot import plot_matrix
 
 log = logging.getLogger(__name__)
@@ -48,18 +47,34 @@ class ClassificationMetric(Metric["ClassificationEvalStats"], ABC):
         pass
 
 
-class ClassificationMetricAccuracy(ClassificationMetric):
-    name = "accuracy"
+class ClassificationMetricFromConfusionMatrix(ClassificationMetric, ABC):
+    """
+    Base class for metrics which are a function of the confusion matrix only.
+    When computed for evaluation stats, all such metrics share the confusion matrix, which is computed only once.
+    """
+    def compute_value_for_eval_stats(self, eval_stats: "ClassificationEvalStats"):
+        return self._compute_value_from_confusion_matrix(eval_stats.get_confusion_matrix())
 
     def _compute_value(self, y_true: PredictionArray, y_predicted: PredictionArray, y_predicted_class_probabilities: PredictionArray):
-        return accuracy_score(y_true=y_true, y_pred=y_predicted)
+        return self._compute_value_from_confusion_matrix(ConfusionMatrix(y_true, y_predicted))
 
+    @abstractmethod
+    def _compute_value_from_confusion_matrix(self, confusion_matrix: "ConfusionMatrix"):
+        pass
+
+
+class ClassificationMetricAccuracy(ClassificationMetricFromConfusionMatrix):
+    name = "accuracy"
 
-class ClassificationMetricBalancedAccuracy(ClassificationMetric):
+    def _compute_value_from_confusion_matrix(self, confusion_matrix: "ConfusionMatrix"):
+        return confusion_matrix.get_accuracy()
+
+
+class ClassificationMetricBalancedAccuracy(ClassificationMetricFromConfusionMatrix):
     name = "balancedAccuracy"
 
-    def _compute_value(self, y_true: PredictionArray, y_predicted: PredictionArray, y_predicted_class_probabilities: PredictionArray):
-        return balanced_accuracy_score(y_true=y_true, y_pred=y_predicted)
+    def _compute_value_from_confusion_matrix(self, confusion_matrix: "ConfusionMatrix"):
+        return confusion_matrix.get_balanced_accuracy()
 
 
 class ClassificationMetricAccuracyWithoutLabels(ClassificationMetric):
@@ -98,7 +113,7 @@ class ClassificationMetricAccuracyWithoutLabels(ClassificationMetric):
                 indices.append(i)
         if len(indices) == 0:
             return self.zero_value
-        return accuracy_score(y_true=y_true[indices], y_pred=y_predicted[indices])
+        return ConfusionMatrix(y_true[indices], y_predicted[indices]).get_accuracy()
 
     def get_paired_metrics(self) -> List[TMetric]:
         if self.probability_threshold is not None:
@@ -107,46 +122,78 @@ class ClassificationMetricAccuracyWithoutLabels(ClassificationMetric):
             return []
 
 
-class ClassificationMetricGeometricMeanOfTrueClassProbability(ClassificationMetric):
-    name = "geoMeanTrueClassProb"
+class ClassProbabilityData:
+    """
+    Numpy representations of predicted class probabilities and the ground truth, which are shared by the metrics
+    that are based on class probabilities (such that they need to be computed only once per evaluation)
+    """
+    def __init__(self, y_true: PredictionArray, y_predicted_class_probabilities: pd.DataFrame, dtype=np.float64):
+        """
+        :param y_true: the true class labels
+        :param y_predicted_class_probabilities: a data frame whose columns are the class labels and whose values are probabilities
+        :param dtype: the floating point type in which to store the probabilities
+        """
+        # store the probabilities in row-major order, as the metrics reduce over the classes of each data point
+        self.probabilities: np.ndarray = np.ascontiguousarray(y_predicted_class_probabilities.to_numpy(dtype=dtype))
+        self.label_to_col_idx = {l: i for i, l in enumerate(y_predicted_class_probabilities.columns)}
+        # -1 if true class is unknown to model (did not appear in training data)
+        self.true_class_col_indices = pd.Categorical(y_true, categories=y_predicted_class_probabilities.columns).codes.astype(int)
+
+    def __len__(self):
+        return len(self.true_class_col_indices)
+
+
+class ClassificationMetricFromProbabilities(ClassificationMetric, ABC):
+    """
+    Base class for metrics which are computed from the predicted class probabilities and the ground truth
+    """
     requires_probabilities = True
 
+    def compute_value_for_eval_stats(self, eval_stats: "ClassificationEvalStats"):
+        if not eval_stats.is_probabilities_available:
+            raise ValueError(f"{self} requires class probabilities")
+        return self._compute_value_from_probability_data(eval_stats.get_class_probability_data())
+
     def _compute_value(self, y_true: PredictionArray, y_predicted: PredictionArray, y_predicted_class_probabilities: PredictionArray):
-        y_predicted_proba_true_class = np.zeros(len(y_true))
-        for i in range(len(y_true)):
-            true_class = y_true[i]
-            if true_class not in y_predicted_class_probabilities.columns:
-                y_predicted_proba_true_class[i] = 0
-            else:
-                y_predicted_proba_true_class[i] = y_predicted_class_probabilities[true_class].iloc[i]
+        return self._compute_value_from_probability_data(ClassProbabilityData(y_true, y_predicted_class_probabilities))
+
+    @abstractmethod
+    def _compute_value_from_probability_data(self, data: ClassProbabilityData):
+        pass
+
+
+class ClassificationMetricGeometricMeanOfTrueClassProbability(ClassificationMetricFromProbabilities):
+    name = "geoMeanTrueClassProb"
+
+    def _compute_value_from_probability_data(self, data: ClassProbabilityData):
+        col_indices = data.true_class_col_indices
+        y_predicted_proba_true_class = np.where(col_indices >= 0, data.probabilities[np.arange(len(col_indices)), col_indices], 0.0)
         # the 1e-3 below prevents lp = -inf due to single entries with y_predicted_proba_true_class=0
         lp = np.log(np.maximum(1e-3, y_predicted_proba_true_class))
-        return np.exp(lp.sum() / len(lp))
+        return np.exp(lp.sum(dtype=np.float64) / len(lp))
 
 
-class ClassificationMetricTopNAccuracy(ClassificationMetric):
-    requires_probabilities = True
-
+class ClassificationMetricTopNAccuracy(ClassificationMetricFromProbabilities):
     def __init__(self, n: int):
         self.n = n
         super().__init__(name=f"top{n}Accuracy")
 
-    def _compute_value(self, y_true: PredictionArray, y_predicted: PredictionArray, y_predicted_class_probabilities: PredictionArray):
-        labels = y_predicted_class_probabilities.columns
-        cnt = 0
-        for i, rowValues in enumerate(y_predicted_class_probabilities.values.tolist()):
-            pairs = sorted(zip(labels, rowValues), key=lambda x: x[1], reverse=True)
-            if y_true[i] in (x[0] for x in pairs[:self.n]):
-                cnt += 1
-        return cnt / len(y_true)
+    def _compute_value_from_probability_data(self, data: ClassProbabilityData):
+        col_indices = data.true_class_col_indices
+        probabilities = data.probabilities
+        p_true = probabilities[np.arange(len(col_indices)), col_indices][:, np.newaxis]
+        # determine the rank of the true class without sorting: it is preceded by all classes with higher probability
+        # and, in case of ties, by the classes appearing before it (consistent with a stable sort)
+        num_preceding = (probabilities > p_true).sum(axis=1) + \
+            ((probabilities == p_true) & (np.arange(probabilities.shape[1]) < col_indices[:, np.newaxis])).sum(axis=1)
+        is_hit = (col_indices >= 0) & (num_preceding < self.n)
+        return is_hit.sum() / len(data)
 
 
-class ClassificationMetricAccuracyMaxProbabilityBeyondThreshold(ClassificationMetric):
+class ClassificationMetricAccuracyMaxProbabilityBeyondThreshold(ClassificationMetricFromProbabilities):
     """
     Accuracy limited to cases where the probability of the most likely class is at least a given threshold
     """
-    requires_probabilities = True
-
     def __init__(self, threshold: float, zero_value=0.0):
         """
         :param threshold: minimum probability of the most likely class
@@ -156,31 +203,23 @@ class ClassificationMetricAccuracyMaxProbabilityBeyondThreshold(ClassificationMe
         self.zeroValue = zero_value
         super().__init__(name=f"accuracy[p_max >= {threshold}]")
 
-    def _compute_value(self, y_true: PredictionArray, y_predicted: PredictionArray, y_predicted_class_probabilities: PredictionArray):
-        labels = y_predicted_class_probabilities.columns
-        label_to_col_idx = {l: i for i, l in enumerate(labels)}
-        rel_freq = RelativeFrequencyCounter()
-        for i, probabilities in enumerate(y_predicted_class_probabilities.values.tolist()):
-            class_idx_predicted = np.argmax(probabilities)
-            prob_predicted = probabilities[class_idx_predicted]
-            if prob_predicted >= self.threshold:
-                class_idx_true = label_to_col_idx.get(y_true[i], -1)  # -1 if true class is unknown to model (did not appear in training data)
-                rel_freq.count(class_idx_predicted == class_idx_true)
-        if rel_freq.num_total == 0:
+    def _compute_value_from_probability_data(self, data: ClassProbabilityData):
+        probabilities = data.probabilities
+        class_idx_predicted = probabilities.argmax(axis=1)
+        is_beyond_threshold = probabilities[np.arange(len(probabilities)), class_idx_predicted] >= self.threshold
+        num_beyond_threshold = is_beyond_threshold.sum()
+        if num_beyond_threshold == 0:
             return self.zeroValue
-        else:
-            return rel_freq.get_relative_frequency()
+        return ((class_idx_predicted == data.true_class_col_indices) & is_beyond_threshold).sum() / num_beyond_threshold
 
     def get_paired_metrics(self) -> List[TMetric]:
         return [ClassificationMetricRelFreqMaxProbabilityBeyondThreshold(self.threshold)]
 
 
-class ClassificationMetricRelFreqMaxProbabilityBeyondThreshold(ClassificationMetric):
+class ClassificationMetricRelFreqMaxProbabilityBeyondThreshold(ClassificationMetricFromProbabilities):
     """
     Relative frequency of cases where the probability of the most likely class is at least a given threshold
     """
-    requires_probabilities = True
-
     def __init__(self, threshold: float):
         """
         :param threshold: minimum probability of the most likely class
@@ -188,12 +227,9 @@ class ClassificationMetricRelFreqMaxProbabilityBeyondThreshold(ClassificationMet
         self.threshold = threshold
         super().__init__(name=f"relFreq[p_max >= {threshold}]")
 
-    def _compute_value(self, y_true: PredictionArray, y_predicted: PredictionArray, y_predicted_class_probabilities: PredictionArray):
-        rel_freq = RelativeFrequencyCounter()
-        for i, probabilities in enumerate(y_predicted_class_probabilities.values.tolist()):
-            p_max = np.max(probabilities)
-            rel_freq.count(p_max >= self.threshold)
-        return rel_freq.get_relative_frequency()
+    def _compute_value_from_probability_data(self, data: ClassProbabilityData):
+        p_max = data.probabilities.max(axis=1)
+        return (p_max >= self.threshold).mean()
 
 
 class BinaryClassificationMetric(ClassificationMetric, ABC):
@@ -205,37 +241,71 @@ class BinaryClassificationMetric(ClassificationMetric, ABC):
         self.positiveClassLabel = positive_class_label
 
 
-class BinaryClassificationMetricPrecision(BinaryClassificationMetric):
+class BinaryClassificationMetricFromCounts(BinaryClassificationMetric, ABC):
+    """
+    Base class for binary classification metrics which are a function of the numbers of true/false positives/negatives.
+    When computed for evaluation stats, the counts are derived from the shared confusion matrix (and are shared by all metrics
+    with the same positive class label).
+    """
+    def _validate_labels(self, labels: Sequence[Any]):
+        """
+        Checks whether the given labels (which occur in the ground truth and the predictions) define a binary classification
+        problem with the positive class label (raising an exception as sklearn's binary metrics do otherwise)
+
+        :param labels: the sorted, unique labels
+        """
+        if len(labels) > 2:
+            raise ValueError(f"Cannot compute binary metric {self.name} for multiclass data with labels {list(labels)}")
+        if len(labels) == 2 and self.positiveClassLabel not in labels:
+            raise ValueError(f"Positive class label {self.positiveClassLabel!r} is not a valid label; it should be one of {list(labels)}")
+
+    def compute_value_for_eval_stats(self, eval_stats: "ClassificationEvalStats"):
+        confusion_matrix = eval_stats.get_confusion_matrix()
+        self._validate_labels(confusion_matrix.labels)
+        return self._compute_value_from_counts(confusion_matrix.get_binary_classification_counts(self.positiveClassLabel))
+
+    def _compute_value(self, y_true: PredictionArray, y_predicted: PredictionArray, y_predicted_class_probabilities: PredictionArray):
+        self._validate_labels(sklearn.utils.multiclass.unique_labels(y_true, y_predicted))
+        is_positive_prediction = np.asarray(y_predicted, dtype=object) == self.positiveClassLabel
+        is_positive_ground_truth = np.asarray(y_true, dtype=object) == self.positiveClassLabel
+        return self._compute_value_from_counts(BinaryClassificationCounts(is_positive_prediction, is_positive_ground_truth))
+
+    @abstractmethod
+    def _compute_value_from_counts(self, counts: "BinaryClassificationCounts"):
+        pass
+
+
+class BinaryClassificationMetricPrecision(BinaryClassificationMetricFromCounts):
     name = "precision"
 
     def __init__(self, positive_class_label):
         super().__init__(positive_class_label)
 
-    def _compute_value(self, y_true: PredictionArray, y_predicted: PredictionArray, y_predicted_class_probabilities: PredictionArray):
-        return precision_score(y_true, y_predicted, pos_label=self.positiveClassLabel, zero_division=0)
+    def _compute_value_from_counts(self, counts: "BinaryClassificationCounts"):
+        return counts.get_precision()
 
     def get_paired_metrics(self) -> List[BinaryClassificationMetric]:
         return [BinaryClassificationMetricRecall(self.positiveClassLabel)]
 
 
-class BinaryClassificationMetricRecall(BinaryClassificationMetric):
+class BinaryClassificationMetricRecall(BinaryClassificationMetricFromCounts):
     name = "recall"
 
     def __init__(self, positive_class_label):
         super().__init__(positive_class_label)
 
-    def _compute_value(self, y_true: PredictionArray, y_predicted: PredictionArray, y_predicted_class_probabilities: PredictionArray):
-        return recall_score(y_true, y_predicted, pos_label=self.positiveClassLabel)
+    def _compute_value_from_counts(self, counts: "BinaryClassificationCounts"):
+        return counts.get_recall()
 
 
-class BinaryClassificationMetricF1Score(BinaryClassificationMetric):
+class BinaryClassificationMetricF1Score(BinaryClassificationMetricFromCounts):
     name = "F1"
 
     def __init__(self, positive_class_label):
         super().__init__(positive_class_label)
 
-    def _compute_value(self, y_true: PredictionArray, y_predicted: PredictionArray, y_predicted_class_probabilities: PredictionArray):
-        return f1_score(y_true, y_predicted, pos_label=self.positiveClassLabel)
+    def _compute_value_from_counts(self, counts: "BinaryClassificationCounts"):
+        return counts.get_f1()
 
 
 class BinaryClassificationMetricRecallForPrecision(BinaryClassificationMetric):
@@ -255,14 +325,10 @@ class BinaryClassificationMetricRecallForPrecision(BinaryClassificationMetric):
 
     def compute_value_for_eval_stats(self, eval_stats: "ClassificationEvalStats"):
         var_data = eval_stats.get_binary_classification_probability_threshold_variation_data()
-        best_recall = None
-        for c in var_data.counts:
-            precision = c.get_precision()
-            if precision >= self.minPrecision:
-                recall = c.get_recall()
-                if best_recall is None or recall > best_recall:
-                    best_recall = recall
-        return self.zero_value if best_recall is None else best_recall
+        is_precision_reached = var_data.get_precision_array() >= self.minPrecision
+        if not np.any(is_precision_reached):
+            return self.zero_value
+        return float(var_data.get_recall_array()[is_precision_reached].max())
 
     def _compute_value(self, y_true: PredictionArray, y_predicted: PredictionArray, y_predicted_class_probabilities: PredictionArray):
         raise NotImplementedError(f"{self.__class__.__qualname__} only supports computeValueForEvalStats")
@@ -286,14 +352,11 @@ class BinaryClassificationMetricPrecisionThreshold(BinaryClassificationMetric):
         super().__init__(positive_class_label, name=f"precision[{threshold}]")
 
     def _compute_value(self, y_true: PredictionArray, y_predicted: PredictionArray, y_predicted_class_probabilities: PredictionArray):
-        rel_freq_correct = RelativeFrequencyCounter()
-        class_idx_positive = list(y_predicted_class_probabilities.columns).index(self.positiveClassLabel)
-        for i, (probabilities, classLabel_true) in enumerate(zip(y_predicted_class_probabilities.values.tolist(), y_true)):
-            prob_predicted = probabilities[class_idx_positive]
-            if prob_predicted >= self.threshold:
-                rel_freq_correct.count(classLabel_true == self.positiveClassLabel)
-        f = rel_freq_correct.get_relative_frequency()
-        return f if f is not None else self.zero_value
+        is_positive_prediction = y_predicted_class_probabilities[self.positiveClassLabel].to_numpy() >= self.threshold
+        if not np.any(is_positive_prediction):
+            return self.zero_value
+        is_positive_ground_truth = np.asarray(y_true, dtype=object) == self.positiveClassLabel
+        return np.count_nonzero(is_positive_ground_truth[is_positive_prediction]) / np.count_nonzero(is_positive_prediction)
 
     def get_paired_metrics(self) -> List[BinaryClassificationMetric]:
         return [BinaryClassificationMetricRecallThreshold(self.threshold, self.positiveClassLabel)]
@@ -316,14 +379,11 @@ class BinaryClassificationMetricRecallThreshold(BinaryClassificationMetric):
         super().__init__(positive_class_label, name=f"recall[{threshold}]")
 
     def _compute_value(self, y_true: PredictionArray, y_predicted: PredictionArray, y_predicted_class_probabilities: PredictionArray):
-        rel_freq_recalled = RelativeFrequencyCounter()
-        class_idx_positive = list(y_predicted_class_probabilities.columns).index(self.positiveClassLabel)
-        for i, (probabilities, classLabel_true) in enumerate(zip(y_predicted_class_probabilities.values.tolist(), y_true)):
-            if self.positiveClassLabel == classLabel_true:
-                prob_predicted = probabilities[class_idx_positive]
-                rel_freq_recalled.count(prob_predicted >= self.threshold)
-        f = rel_freq_recalled.get_relative_frequency()
-        return f if f is not None else self.zero_value
+        is_positive_ground_truth = np.asarray(y_true, dtype=object) == self.positiveClassLabel
+        if not np.any(is_positive_ground_truth):
+            return self.zero_value
+        is_positive_prediction = y_predicted_class_probabilities[self.positiveClassLabel].to_numpy() >= self.threshold
+        return np.count_nonzero(is_positive_prediction[is_positive_ground_truth]) / np.count_nonzero(is_positive_ground_truth)
 
 
 DEFAULT_MULTICLASS_CLASSIFICATION_METRICS = (ClassificationMetricAccuracy(), ClassificationMetricBalancedAccuracy(),
@@ -342,7 +402,8 @@ class ClassificationEvalStats(PredictionEvalStats["ClassificationMetric"]):
             labels: Optional[PredictionArray] = None,
             metrics: Optional[Sequence["ClassificationMetric"]] = None,
             additional_metrics: Optional[Sequence["ClassificationMetric"]] = None,
-            binary_positive_label=GUESS):
+            binary_positive_label=GUESS,
+            probabilities_dtype=np.float64):
         """
         :param y_predicted: the predicted class labels
         :param y_true: the true class labels
@@ -356,8 +417,12 @@ class ClassificationEvalStats(PredictionEvalStats["ClassificationMetric"]):
             if GUESS (default), check `labels` (if length 2) for occurrence of one of BINARY_CLASSIFICATION_POSITIVE_LABEL_CANDIDATES in
             the respective order and use the first one found (if any);
             if None, treat the problem as non-binary, regardless of the labels being used.
+        :param probabilities_dtype: the floating point type in which class probabilities are represented for the computation of
+            probability-based metrics; np.float32 halves the memory traffic of these computations for large data sets at the cost
+            of precision (which may affect comparisons against thresholds in borderline cases)
         """
         self.labels = labels
+        self.probabilities_dtype = probabilities_dtype
         self.y_predicted_class_probabilities = y_predicted_class_probabilities
         self.is_probabilities_available = y_predicted_class_probabilities is not None
         if self.is_probabilities_available:
@@ -405,22 +470,76 @@ class ClassificationEvalStats(PredictionEvalStats["ClassificationMetric"]):
 
         # transient members
         self._binary_classification_probability_threshold_variation_data = None
+        self._class_probability_data: Optional[ClassProbabilityData] = None
+        self._confusion_matrix: Optional[ConfusionMatrix] = None
+        self._label_codes: Optional[Tuple[np.ndarray, np.ndarray]] = None
 
     def __getstate__(self):
-        return getstate(ClassificationEvalStats, self, transient_properties=["_binaryClassificationProbabilityThresholdVariationData"])
+        return getstate(ClassificationEvalStats, self, transient_properties=["_binary_classification_probability_threshold_variation_data",
+            "_class_probability_data", "_confusion_matrix", "_label_codes"])
+
+    def __setstate__(self, state):
+        setstate(ClassificationEvalStats, self, state, new_optional_properties=["_binary_classification_probability_threshold_variation_data",
+            "_class_probability_data", "_confusion_matrix", "_label_codes"], new_default_properties={"probabilities_dtype": np.float64})
+
+    def clear_cache(self):
+        super().clear_cache()
+        self._binary_classification_probability_threshold_variation_data = None
+        self._class_probability_data = None
+        self._confusion_matrix = None
+        self._label_codes = None
+
+    def release_values(self):
+        super().release_values()
+        self.y_predicted_class_probabilities = None
+        self._class_probability_data = None
+        self._label_codes = None
+
+    def get_label_codes(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :return: a pair (y_true_codes, y_predicted_codes) of integer arrays containing, for each data point, the index of the
+            respective class label in ``labels`` (or -1 if the label is not contained in ``labels``)
+        """
+        if self._label_codes is None:
+            self._label_codes = tuple(pd.Categorical(y, categories=self.labels).codes.astype(np.int32)
+                for y in (self.y_true, self.y_predicted))
+        return self._label_codes
+
+    def get_positive_ground_truth_mask(self) -> np.ndarray:
+        """
+        :return: a Boolean array indicating, for each data point, whether the true class is the binary positive class
+        """
+        if self.binary_positive_label not in self.labels:
+            return np.asarray(self.y_true, dtype=object) == self.binary_positive_label
+        y_true_codes, _ = self.get_label_codes()
+        return y_true_codes == list(self.labels).index(self.binary_positive_label)
 
     def get_confusion_matrix(self) -> "ConfusionMatrix":
-        return ConfusionMatrix(self.y_true, self.y_predicted)
+        if self._confusion_matrix is None:
+            self._confusion_matrix = ConfusionMatrix(self.y_true, self.y_predicted)
+        return self._confusion_matrix
 
     def get_binary_classification_probability_threshold_variation_data(self) -> "BinaryClassificationProbabilityThresholdVariationData":
         if self._binary_classification_probability_threshold_variation_data is None:
             self._binary_classification_probability_threshold_variation_data = BinaryClassificationProbabilityThresholdVariationData(self)
         return self._binary_classification_probability_threshold_variation_data
 
+    def get_class_probability_data(self) -> ClassProbabilityData:
+        """
+        :return: the numpy representations of the class probabilities and the ground truth, which are shared by all
+            probability-based metrics
+        """
+        if self._class_probability_data is None:
+            if not self.is_probabilities_available:
+                raise ValueError("No probability data")
+            self._class_probability_data = ClassProbabilityData(self.y_true, self.y_predicted_class_probabilities,
+                dtype=self.probabilities_dtype)
+        return self._class_probability_data
+
     def get_accuracy(self):
         return self.compute_metric_value(ClassificationMetricAccuracy())
 
-    def metrics_dict(self) -> Dict[str, float]:
+    def _compute_metrics_dict(self) -> Dict[str, float]:
         d = {}
         for metric in self.metrics:
             if not metric.requires_probabilities or self.is_probabilities_available:
@@ -435,15 +554,25 @@ class ClassificationEvalStats(PredictionEvalStats["ClassificationMetric"]):
         cm = self.get_confusion_matrix()
         return cm.plot(normalize=normalize, title_add=title_add)
 
+    def get_precision_recall_curve(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Computes the precision-recall curve for binary classification (using sklearn's precision_recall_curve)
+
+        :return: a triple (precision, recall, thresholds), where precision and recall are in order of increasing thresholds
+            and contain an additional final point (precision 1, recall 0) which has no corresponding threshold
+        """
+        if not self.is_probabilities_available or not self.is_binary:
+            raise ValueError("Precision-recall curve requires probabilities and is applicable to binary classification only")
+        probabilities = self.y_predicted_class_probabilities[self.binary_positive_label]
+        return precision_recall_curve(self.y_true, probabilities, pos_label=self.binary_positive_label)
+
     def plot_precision_recall_curve(self, title_add: str = None) -> plt.Figure:
         from sklearn.metrics import PrecisionRecallDisplay  # only supported by newer versions of sklearn
         if not self.is_probabilities_available:
             raise Exception("Precision-recall curve requires probabilities")
         if not self.is_binary:
             raise Exception("Precision-recall curve is not applicable to non-binary classification")
-        probabilities = self.y_predicted_class_probabilities[self.binary_positive_label]
-        precision, recall, thresholds = precision_recall_curve(y_true=self.y_true, probas_pred=probabilities,
-            pos_label=self.binary_positive_label)
+        precision, recall, thresholds = self.get_precision_recall_curve()
         disp = PrecisionRecallDisplay(precision, recall)
         disp.plot()
         ax: plt.Axes = disp.ax_
@@ -459,8 +588,12 @@ class ClassificationEvalStats(PredictionEvalStats["ClassificationMetric"]):
 
 
 class ClassificationEvalStatsCollection(EvalStatsCollection[ClassificationEvalStats, ClassificationMetric]):
-    def __init__(self, eval_stats_list: List[ClassificationEvalStats]):
-        super().__init__(eval_stats_list)
+    def __init__(self, eval_stats_list: List[ClassificationEvalStats], num_threads: int = 1):
+        """
+        :param eval_stats_list: the evaluation stats objects to collect
+        :param num_threads: the number of threads with which to compute the metrics of the evaluation stats objects concurrently
+        """
+        super().__init__(eval_stats_list, num_threads=num_threads)
         self.globalStats = None
 
     def get_combined_eval_stats(self) -> ClassificationEvalStats:
@@ -481,14 +614,71 @@ class ClassificationEvalStatsCollection(EvalStatsCollection[ClassificationEvalSt
                 y_probs = None
                 labels = es0.labels
             self.globalStats = ClassificationEvalStats(y_predicted=y_predicted, y_true=y_true, y_predicted_class_probabilities=y_probs,
-                labels=labels, binary_positive_label=es0.binary_positive_label, metrics=es0.metrics)
+                labels=labels, binary_positive_label=es0.binary_positive_label, metrics=es0.metrics,
+                probabilities_dtype=es0.probabilities_dtype)
         return self.globalStats
 
 
 class ConfusionMatrix:
     def __init__(self, y_true: PredictionArray, y_predicted: PredictionArray):
         self.labels = sklearn.utils.multiclass.unique_labels(y_true, y_predicted)
-        self.confusionMatrix = confusion_matrix(y_true, y_predicted, labels=self.labels)
+        # encode the (sorted) labels as integers and count all (true, predicted) pairs in a single pass;
+        # the matrix is stored in sparse form, as it is typically sparse for problems with many classes
+        num_labels = len(self.labels)
+        true_indices = np.searchsorted(self.labels, np.asarray(y_true))
+        predicted_indices = np.searchsorted(self.labels, np.asarray(y_predicted))
+        self.sparseConfusionMatrix = scipy.sparse.coo_matrix((np.ones(len(true_indices), dtype=np.int64),
+            (true_indices, predicted_indices)), shape=(num_labels, num_labels)).tocsr()
+        self._binaryCountsByPositiveLabel: Dict[Any, BinaryClassificationCounts] = {}
+
+    def __setstate__(self, state):
+        if "confusionMatrix" in state:
+            state["sparseConfusionMatrix"] = scipy.sparse.csr_matrix(state.pop("confusionMatrix"))
+        state.setdefault("_binaryCountsByPositiveLabel", {})
+        self.__dict__ = state
+
+    @property
+    def confusionMatrix(self) -> np.ndarray:
+        """
+        the dense confusion matrix, where the entry at [i, j] is the number of data points with true class labels[i]
+        and predicted class labels[j]
+        """
+        return self.sparseConfusionMatrix.toarray()
+
+    def get_accuracy(self) -> float:
+        return self.sparseConfusionMatrix.diagonal().sum() / self.sparseConfusionMatrix.sum()
+
+    def get_balanced_accuracy(self) -> float:
+        """
+        :return: the average of the recall values of all classes that appear in the ground truth
+        """
+        num_true = np.asarray(self.sparseConfusionMatrix.sum(axis=1)).ravel()
+        is_present = num_true > 0
+        if not np.all(is_present):
+            log.warning("y_pred contains classes not in y_true")
+        return np.mean(self.sparseConfusionMatrix.diagonal()[is_present] / num_true[is_present])
+
+    def get_binary_classification_counts(self, positive_class_label) -> "BinaryClassificationCounts":
+        """
+        :param positive_class_label: the label of the positive class; all other classes are considered negative
+        :return: the counts for the binary classification problem
+        """
+        counts = self._binaryCountsByPositiveLabel.get(positive_class_label)
+        if counts is None:
+            counts = self._compute_binary_classification_counts(positive_class_label)
+            self._binaryCountsByPositiveLabel[positive_class_label] = counts
+        return counts
+
+    def _compute_binary_classification_counts(self, positive_class_label) -> "BinaryClassificationCounts":
+        cm = self.sparseConfusionMatrix
+        total = cm.sum()
+        idx = np.searchsorted(self.labels, positive_class_label)
+        if idx == len(self.labels) or self.labels[idx] != positive_class_label:
+            return BinaryClassificationCounts.from_counts(0, total, 0, 0)
+        tp = cm[idx, idx]
+        fp = cm[:, idx].sum() - tp
+        fn = cm[idx, :].sum() - tp
+        return BinaryClassificationCounts.from_counts(tp, total - tp - fp - fn, fp, fn)
 
     def plot(self, normalize: bool = True, title_add: str = None):
         title = 'Normalized Confusion Matrix' if normalize else 'Confusion Matrix (Counts)'
@@ -505,26 +695,35 @@ class BinaryClassificationCounts:
             is zero (i.e. zero counted cases)
         """
         self.zeroDenominatorMetricValue = zero_denominator_metric_value
-        self.tp = 0
-        self.tn = 0
-        self.fp = 0
-        self.fn = 0
-        for predPositive, gtPositive in zip(is_positive_prediction, is_positive_ground_truth):
-            if gtPositive:
-                if predPositive:
-                    self.tp += 1
-                else:
-                    self.fn += 1
-            else:
-                if predPositive:
-                    self.fp += 1
-                else:
-                    self.tn += 1
+        is_positive_prediction = np.asarray(is_positive_prediction, dtype=bool)
+        is_positive_ground_truth = np.asarray(is_positive_ground_truth, dtype=bool)
+        self.tp = int(np.count_nonzero(is_positive_prediction & is_positive_ground_truth))
+        self.fp = int(np.count_nonzero(is_positive_prediction & ~is_positive_ground_truth))
+        self.fn = int(np.count_nonzero(~is_positive_prediction & is_positive_ground_truth))
+        self.tn = len(is_positive_prediction) - self.tp - self.fp - self.fn
+
+    @classmethod
+    def from_counts(cls, tp: int, tn: int, fp: int, fn: int, zero_denominator_metric_value: float = 0.) -> "BinaryClassificationCounts":
+        """
+        Creates an instance from precomputed counts
+
+        :param tp: the number of true positives
+        :param tn: the number of true negatives
+        :param fp: the number of false positives
+        :param fn: the number of false negatives
+        :param zero_denominator_metric_value: the result to return for metrics such as precision and recall in case the denominator
+            is zero (i.e. zero counted cases)
+        :return: the instance
+        """
+        counts = cls.__new__(cls)
+        counts.zeroDenominatorMetricValue = zero_denominator_metric_value
+        counts.tp, counts.tn, counts.fp, counts.fn = int(tp), int(tn), int(fp), int(fn)
+        return counts
 
     @classmethod
     def from_probability_threshold(cls, probabilities: Sequence[float], threshold: float, is_positive_ground_truth: Sequence[bool]) \
             -> "BinaryClassificationCounts":
-        return cls([p >= threshold for p in probabilities], is_positive_ground_truth)
+        return cls(np.asarray(probabilities) >= threshold, is_positive_ground_truth)
 
     @classmethod
     def from_eval_stats(cls, eval_stats: ClassificationEvalStats, threshold=0.5) -> "BinaryClassificationCounts":
@@ -534,7 +733,7 @@ class BinaryClassificationCounts:
             raise ValueError("No probability data")
         pos_class_label = eval_stats.binary_positive_label
         probs = eval_stats.y_predicted_class_probabilities[pos_class_label]
-        is_positive_gt = [gtLabel == pos_class_label for gtLabel in eval_stats.y_true]
+        is_positive_gt = eval_stats.get_positive_ground_truth_mask()
         return cls.from_probability_threshold(probabilities=probs, threshold=threshold, is_positive_ground_truth=is_positive_gt)
 
     def _frac(self, numerator, denominator):
@@ -557,12 +756,79 @@ class BinaryClassificationCounts:
         return positive / (positive + negative)
 
 
+class _BinaryClassificationCountsSequence(Sequence[BinaryClassificationCounts]):
+    """
+    A read-only sequence of counts objects which are created on demand from arrays of counts
+    """
+    def __init__(self, tp: np.ndarray, tn: np.ndarray, fp: np.ndarray, fn: np.ndarray):
+        self.tp = tp
+        self.tn = tn
+        self.fp = fp
+        self.fn = fn
+
+    def __len__(self):
+        return len(self.tp)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        return BinaryClassificationCounts.from_counts(self.tp[idx], self.tn[idx], self.fp[idx], self.fn[idx])
+
+
 class BinaryClassificationProbabilityThresholdVariationData:
     def __init__(self, eval_stats: ClassificationEvalStats):
+        if not eval_stats.is_binary:
+            raise ValueError("Probability threshold variation data can only be computed for binary classification problems")
+        if eval_stats.y_predicted_class_probabilities is None:
+            raise ValueError("No probability data")
         self.thresholds = np.linspace(0, 1, 101)
-        self.counts: List[BinaryClassificationCounts] = []
-        for threshold in self.thresholds:
-            self.counts.append(BinaryClassificationCounts.from_eval_stats(eval_stats, threshold=threshold))
+
+        # compute the counts for all thresholds in a single sweep over the sorted probabilities:
+        # the prediction is positive if the probability is at least the threshold, so for each threshold, the number of
+        # negative predictions is given by the insertion index of the threshold in the sorted array
+        pos_class_label = eval_stats.binary_positive_label
+        probabilities = eval_stats.y_predicted_class_probabilities[pos_class_label].values
+        is_positive_gt = eval_stats.get_positive_ground_truth_mask()
+        sort_order = np.argsort(probabilities, kind="stable")
+        cum_num_positive_gt = np.concatenate(([0], np.cumsum(is_positive_gt[sort_order])))
+        num_negative_predictions = np.searchsorted(probabilities[sort_order], self.thresholds, side="left")
+        self.fn: np.ndarray = cum_num_positive_gt[num_negative_predictions]
+        self.tn: np.ndarray = num_negative_predictions - self.fn
+        self.tp: np.ndarray = cum_num_positive_gt[-1] - self.fn
+        self.fp: np.ndarray = (len(probabilities) - num_negative_predictions) - self.tp
+
+        self.counts: Sequence[BinaryClassificationCounts] = _BinaryClassificationCountsSequence(self.tp, self.tn, self.fp, self.fn)
+
+    @staticmethod
+    def _frac(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+        # analogous to BinaryClassificationCounts, the value for a zero denominator is 0
+        result = np.zeros(len(denominator))
+        np.divide(numerator, denominator, out=result, where=denominator != 0)
+        return result
+
+    def get_precision_array(self) -> np.ndarray:
+        """
+        :return: the precision values for all thresholds
+        """
+        return self._frac(self.tp, self.tp + self.fp)
+
+    def get_recall_array(self) -> np.ndarray:
+        """
+        :return: the recall values for all thresholds
+        """
+        return self._frac(self.tp, self.tp + self.fn)
+
+    def get_f1_array(self) -> np.ndarray:
+        """
+        :return: the F1 scores for all thresholds
+        """
+        return self._frac(self.tp, self.tp + 0.5 * (self.fp + self.fn))
+
+    def get_rel_freq_positive_array(self) -> np.ndarray:
+        """
+        :return: the relative frequencies of positive predictions for all thresholds
+        """
+        return (self.tp + self.fp) / (self.tp + self.tn + self.fp + self.fn)
 
     def plot_precision_recall(self, subtitle=None) -> plt.Figure:
         fig = plt.figure()
@@ -571,14 +837,10 @@ class BinaryClassificationProbabilityThresholdVariationData:
             title += "\n" + subtitle
         plt.title(title)
         plt.xlabel("probability threshold")
-        precision = [c.get_precision() for c in self.counts]
-        recall = [c.get_recall() for c in self.counts]
-        f1 = [c.get_f1() for c in self.counts]
-        rf_positive = [c.get_rel_freq_positive() for c in self.counts]
-        plt.plot(self.thresholds, precision, label="precision")
-        plt.plot(self.thresholds, recall, label="recall")
-        plt.plot(self.thresholds, f1, label="F1-score")
-        plt.plot(self.thresholds, rf_positive, label="rel. freq. positive")
+        plt.plot(self.thresholds, self.get_precision_array(), label="precision")
+        plt.plot(self.thresholds, self.get_recall_array(), label="recall")
+        plt.plot(self.thresholds, self.get_f1_array(), label="F1-score")
+        plt.plot(self.thresholds, self.get_rel_freq_positive_array(), label="rel. freq. positive")
         plt.legend()
         return fig
 
@@ -589,8 +851,7 @@ class BinaryClassificationProbabilityThresholdVariationData:
             title += "\n" + subtitle
         plt.title(title)
         plt.xlabel("probability threshold")
-        plt.stackplot(self.thresholds,
-            [c.tp for c in self.counts], [c.tn for c in self.counts], [c.fp for c in self.counts], [c.fn for c in self.counts],
+        plt.stackplot(self.thresholds, self.tp, self.tn, self.fp, self.fn,
             labels=["true positives", "true negatives", "false positives", "false negatives"],
             colors=["#4fa244", "#79c36f", "#a25344", "#c37d6f"])
         plt.legend()
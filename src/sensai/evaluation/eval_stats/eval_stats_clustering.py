@@ -47,8 +47,8 @@ class ClusterLabelsEvalStats(EvalStats[TMetric], ABC):
             result[self.NOISE_SIZE] = int(self.noiseClusterSize)
         return result
 
-    def metrics_dict(self) -> Dict[str, float]:
-        metrics_dict = super().metrics_dict()
+    def _compute_metrics_dict(self) -> Dict[str, float]:
+        metrics_dict = super()._compute_metrics_dict()
         metrics_dict.update(self.get_distribution_summary())
         return metrics_dict
 
@@ -16,7 +16,8 @@ log = logging.getLogger(__name__)
 class RegressionMetric(Metric["RegressionEvalStats"], ABC):
     def compute_value_for_eval_stats(self, eval_stats: "RegressionEvalStats", model: VectorRegressionModel = None,
             io_data: InputOutputData = None):
-        return self.compute_value(np.array(eval_stats.y_true), np.array(eval_stats.y_predicted), model=model, io_data=io_data)
+        y_true, y_predicted = eval_stats.get_value_arrays()
+        return self.compute_value(y_true, y_predicted, model=model, io_data=io_data)
 
     @classmethod
     @abstractmethod
@@ -199,7 +200,8 @@ class RegressionEvalStats(PredictionEvalStats["RegressionMetric"]):
 
         :return: the resulting figure object or None
         """
-        errors = np.array(self.y_predicted) - np.array(self.y_true)
+        y_true, y_predicted = self.get_value_arrays()
+        errors = y_predicted - y_true
         title = "Prediction Error Distribution"
         if title_add is not None:
             title += "\n" + title_add
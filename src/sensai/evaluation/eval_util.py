@@ -3,10 +3,14 @@ This module contains methods and classes that facilitate evaluation of different
 workflow for evaluation is to use these higher-level functionalities instead of instantiating
 the evaluation classes directly.
 """
-import functools
+import contextlib
+import hashlib
 import logging
+import os
+import pickle
+import weakref
+from concurrent.futures import ProcessPoolExecutor
 from abc import ABC, abstractmethod
-from collections import defaultdict
 from dataclasses import dataclass
 from typing import Dict, Any, Union, Generic, TypeVar, Optional, Sequence, Callable, Set, Iterable, List, Iterator, Tuple
 
@@ -34,7 +38,9 @@ from ..data import InputOutputData
 from ..feature_importance import AggregatedFeatureImportance, FeatureImportanceProvider, plot_feature_importance, FeatureImportance
 from ..tracking import TrackedExperiment
 from ..tracking.tracking_base import TrackingContext
+from ..util.cache import cached
 from ..util.deprecation import deprecated
+from ..util.hash import pickle_hash
 from ..util.io import ResultWriter
 from ..util.string import pretty_string_repr
 from ..vector_model import VectorClassificationModel, VectorRegressionModel, VectorModel, VectorModelBase
@@ -51,13 +57,23 @@ TEvalData = TypeVar("TEvalData", bound=VectorModelEvaluationData)
 TCrossValData = TypeVar("TCrossValData", bound=VectorModelCrossValidationData)
 
 
+_is_regression_model_cache: "weakref.WeakKeyDictionary[VectorModel, bool]" = weakref.WeakKeyDictionary()
+
+
 def _is_regression(model: Optional[VectorModel], is_regression: Optional[bool]) -> bool:
     if model is None and is_regression is None or (model is not None and is_regression is not None):
         raise ValueError("One of the two parameters have to be passed: model or isRegression")
 
     if is_regression is None:
         model: VectorModel
-        return model.is_regression_model()
+        try:
+            result = _is_regression_model_cache.get(model)
+            if result is None:
+                result = model.is_regression_model()
+                _is_regression_model_cache[model] = result
+            return result
+        except TypeError:  # model is not hashable/weakly referenceable
+            return model.is_regression_model()
     return is_regression
 
 
@@ -169,26 +185,32 @@ class EvalStatsPlotCollector(Generic[TEvalStats, TEvalStatsPlot]):
     def __init__(self):
         self.plots: Dict[str, EvalStatsPlot] = {}
         self.disabled_plots: Set[str] = set()
+        self._enabled_plots: Optional[List[Tuple[str, EvalStatsPlot]]] = None
 
     def add_plot(self, name: str, plot: EvalStatsPlot):
         self.plots[name] = plot
+        self._enabled_plots = None
+
+    def _get_enabled_plot_items(self) -> List[Tuple[str, EvalStatsPlot]]:
+        if self._enabled_plots is None:
+            unknown_disabled_plots = self.disabled_plots.difference(self.plots)
+            if len(unknown_disabled_plots) > 0:
+                log.warning(f"Plots were disabled which are not registered: {unknown_disabled_plots}; known plots: {set(self.plots)}")
+            self._enabled_plots = [(name, plot) for name, plot in self.plots.items() if name not in self.disabled_plots]
+        return self._enabled_plots
 
     def get_enabled_plots(self) -> List[str]:
-        return [p for p in self.plots if p not in self.disabled_plots]
+        return [name for name, _ in self._get_enabled_plot_items()]
 
     def disable_plots(self, *names: str):
         self.disabled_plots.update(names)
+        self._enabled_plots = None
 
     def create_plots(self, eval_stats: EvalStats, subtitle: str, result_collector: EvaluationResultCollector):
-        known_plots = set(self.plots.keys())
-        unknown_disabled_plots = self.disabled_plots.difference(known_plots)
-        if len(unknown_disabled_plots) > 0:
-            log.warning(f"Plots were disabled which are not registered: {unknown_disabled_plots}; known plots: {known_plots}")
-        for name, plot in self.plots.items():
-            if name not in self.disabled_plots:
-                fig = plot.create_figure(eval_stats, subtitle)
-                if fig is not None:
-                    result_collector.add_figure(name, fig)
+        for name, plot in self._get_enabled_plot_items():
+            fig = plot.create_figure(eval_stats, subtitle)
+            if fig is not None:
+                result_collector.add_figure(name, fig)
 
 
 class RegressionEvalStatsPlotCollector(EvalStatsPlotCollector[RegressionEvalStats, RegressionEvalStatsPlot]):
@@ -237,6 +259,7 @@ class ModelEvaluation(ABC, Generic[TModel, TEvaluator, TEvalData, TCrossValidato
         self.io_data = io_data
         self.test_io_data = test_io_data
         self.eval_stats_plot_collector = eval_stats_plot_collector
+        self._data_hash: Optional[str] = None
 
     def create_evaluator(self, model: TModel = None, is_regression: bool = None) -> TEvaluator:
         """
@@ -281,16 +304,16 @@ class ModelEvaluation(ABC, Generic[TModel, TEvaluator, TEvalData, TCrossValidato
         log.info(f"Evaluating {model} via {evaluator}")
 
         def gather_results(result_data: VectorModelEvaluationData, res_writer, subtitle_prefix=""):
-            str_eval_results = ""
+            str_eval_result_lines = []
             for predictedVarName in result_data.predicted_var_names:
                 eval_stats = result_data.get_eval_stats(predictedVarName)
                 str_eval_result = str(eval_stats)
                 if log_results:
                     log.info(f"{subtitle_prefix}Evaluation results for {predictedVarName}: {str_eval_result}")
-                str_eval_results += predictedVarName + ": " + str_eval_result + "\n"
+                str_eval_result_lines.append(f"{predictedVarName}: {str_eval_result}\n")
                 if write_eval_stats and res_writer is not None:
                     res_writer.write_pickle(f"eval-stats-{predictedVarName}", eval_stats)
-            str_eval_results += f"\n\n{pretty_string_repr(model)}"
+            str_eval_results = "".join(str_eval_result_lines) + f"\n\n{pretty_string_repr(model)}"
             if res_writer is not None:
                 res_writer.write_text_file("evaluator-results", str_eval_results)
             if create_plots:
@@ -357,7 +380,12 @@ class ModelEvaluation(ABC, Generic[TModel, TEvaluator, TEvalData, TCrossValidato
             also_include_unsorted_results: bool = False, also_include_cross_val_global_stats: bool = False,
             visitors: Optional[Iterable["ModelComparisonVisitor"]] = None,
             write_visitor_results=False, write_csv=False,
-            tracked_experiment: Optional[TrackedExperiment] = None) -> "ModelComparisonData":
+            tracked_experiment: Optional[TrackedExperiment] = None,
+            num_processes: int = 1,
+            cache_dir: Optional[str] = None,
+            cache_replay_only: bool = False,
+            share_input_preprocessors: bool = False,
+            retain_predictions: bool = True) -> "ModelComparisonData":
         """
         Compares several models via simple evaluation or cross-validation
 
@@ -381,55 +409,96 @@ class ModelEvaluation(ABC, Generic[TModel, TEvaluator, TEvalData, TCrossValidato
         :param write_visitor_results: whether to collect results from visitors (if any) after the comparison
         :param write_csv: whether to write metrics table to CSV files
         :param tracked_experiment: an experiment for tracking
+        :param num_processes: the number of parallel processes in which to evaluate the models (use 1 to evaluate them sequentially
+            in the current process). If greater than 1, models are evaluated in worker processes, i.e. the given model instances
+            are not fitted in place (the fitted models are contained in the evaluation results instead), and the models as well
+            as the tracked experiment (if any) must be picklable. Visitors are always applied in the current process.
+        :param cache_dir: a directory in which to persistently cache the evaluation result of each model. A cached result is reused
+            if the model's string representation, the evaluation/cross-validation parameters and the data are all unchanged, in which
+            case the model is not fitted again (and individual results are not rewritten). If None, do not cache results.
+            NOTE: The model is identified by its string representation only (as the pickled representation of a model is not
+            deterministic), i.e. aspects of a model's configuration that are not reflected in its string representation (e.g.
+            the implementation of a function it uses) are disregarded; use distinct model names or cache directories for models
+            that differ only in such aspects. Furthermore, since the default names of unnamed components (e.g. feature generators)
+            are unique to each instance, such components should be named explicitly for results to be reusable.
+        :param cache_replay_only: whether to require, if `cache_dir` is given, that all evaluation results are already cached,
+            raising an exception otherwise; this ensures that a comparison is merely reproduced from previously computed results
+        :param share_input_preprocessors: whether models with identically configured input preprocessors (feature generators and
+            transformers) shall share fitted preprocessors, i.e. preprocessors are fitted only for the first such model, all other
+            models using copies of them (see :meth:`VectorModelEvaluator.set_input_preprocessor_sharing` for details and caveats).
+            Applies only if the models are evaluated sequentially (num_processes=1).
+        :param retain_predictions: whether to retain the predictions (and ground truth values) in the evaluation results of each model.
+            If False, they are released as soon as a model's results have been processed (including visitors), such that only the
+            predictions of a single model need to be held in memory at any time; the returned results then only support the
+            retrieval of metrics (no plots, no computation of further metrics).
         :return: the comparison results
         """
+        if use_cross_validation and not fit_models and len(models) > 0:
+            raise ValueError("Cross-validation necessitates that models be trained several times; got fitModels=False")
+
         # collect model evaluation results
         stats_list = []
+        model_names = []
         result_by_model_name = {}
+        cross_val_combined_rows = [] if use_cross_validation and also_include_cross_val_global_stats else None
         evaluator = None
         cross_validator = None
-        for i, model in enumerate(models, start=1):
-            model_name = model.get_name()
-            log.info(f"Evaluating model {i}/{len(models)} named '{model_name}' ...")
+        if len(models) > 0:
             if use_cross_validation:
-                if not fit_models:
-                    raise ValueError("Cross-validation necessitates that models be trained several times; got fitModels=False")
-                if cross_validator is None:
-                    cross_validator = self.create_cross_validator(model)
-                cross_val_data = self.perform_cross_validation(model, result_writer=result_writer if write_individual_results else None,
-                    cross_validator=cross_validator, tracked_experiment=tracked_experiment)
-                model_result = ModelComparisonData.Result(cross_validation_data=cross_val_data)
-                result_by_model_name[model_name] = model_result
-                eval_stats_collection = cross_val_data.get_eval_stats_collection()
-                stats_dict = eval_stats_collection.agg_metrics_dict()
+                cross_validator = self.create_cross_validator(models[0])
             else:
-                if evaluator is None:
-                    evaluator = self.create_evaluator(model)
-                eval_data = self.perform_simple_evaluation(model, result_writer=result_writer if write_individual_results else None,
-                    fit_model=fit_models, evaluator=evaluator, tracked_experiment=tracked_experiment)
-                model_result = ModelComparisonData.Result(eval_data=eval_data)
+                evaluator = self.create_evaluator(models[0])
+        preprocessor_sharing_evaluator = evaluator if evaluator is not None else cross_validator
+        if share_input_preprocessors and preprocessor_sharing_evaluator is not None:
+            preprocessor_sharing_evaluator.set_input_preprocessor_sharing(True)
+        individual_result_writer = result_writer if write_individual_results else None
+        if cache_dir is not None:
+            data_hash = self._get_data_hash()
+            cache_paths = [self._get_evaluation_cache_path(cache_dir, model, use_cross_validation, fit_models, data_hash)
+                for model in models]
+        else:
+            cache_paths = [None] * len(models)
+        parallel = num_processes != 1 and len(models) > 1
+        with ProcessPoolExecutor(max_workers=num_processes) if parallel else contextlib.nullcontext() as executor:
+            if executor is None:
+                model_results = (self._evaluate_model_for_comparison(model, i, len(models), use_cross_validation, fit_models,
+                    individual_result_writer, evaluator, cross_validator, tracked_experiment, cache_path, cache_replay_only)
+                    for i, (model, cache_path) in enumerate(zip(models, cache_paths), start=1))
+            else:
+                futures = [executor.submit(self._evaluate_model_for_comparison, model, i, len(models), use_cross_validation, fit_models,
+                    individual_result_writer, evaluator, cross_validator, tracked_experiment, cache_path, cache_replay_only)
+                    for i, (model, cache_path) in enumerate(zip(models, cache_paths), start=1)]
+                model_results = (future.result() for future in futures)
+            for model, model_result in zip(models, model_results):
+                model_name = model.get_name()
                 result_by_model_name[model_name] = model_result
-                eval_stats = eval_data.get_eval_stats()
-                stats_dict = eval_stats.metrics_dict()
-            stats_dict["model_name"] = model_name
-            stats_list.append(stats_dict)
-            if visitors is not None:
-                for visitor in visitors:
-                    visitor.visit(model_name, model_result)
-        results_df = pd.DataFrame(stats_list).set_index("model_name")
+                if use_cross_validation:
+                    stats_dict = model_result.cross_validation_data.get_eval_stats_collection().agg_metrics_dict()
+                else:
+                    stats_dict = model_result.eval_data.get_eval_stats().metrics_dict()
+                stats_list.append(stats_dict)
+                model_names.append(model_name)
+                if visitors is not None:
+                    for visitor in visitors:
+                        visitor.visit(model_name, model_result)
+                if cross_val_combined_rows is not None:
+                    try:
+                        stats_dict = model_result.cross_validation_data.get_eval_stats_collection().get_global_stats().metrics_dict()
+                        cross_val_combined_rows.append(stats_dict)
+                    except Exception as e:
+                        log.error(f"Creation of global stats data frame from cross-validation folds failed: {e}")
+                        cross_val_combined_rows = None
+                if not retain_predictions:
+                    model_result.release_predictions()
+        if share_input_preprocessors and preprocessor_sharing_evaluator is not None:
+            preprocessor_sharing_evaluator.set_input_preprocessor_sharing(False)  # discard the stored preprocessors
+        # construct the results data frame with the model name index directly (rather than via a column and set_index)
+        results_df = pd.DataFrame(stats_list, index=pd.Index(model_names, name="model_name"))
 
         # compute results data frame with combined set of data points (for cross-validation only)
         cross_val_combined_results_df = None
-        if use_cross_validation and also_include_cross_val_global_stats:
-            try:
-                rows = []
-                for model_name, result in result_by_model_name.items():
-                    stats_dict = result.cross_validation_data.get_eval_stats_collection().get_global_stats().metrics_dict()
-                    stats_dict["model_name"] = model_name
-                    rows.append(stats_dict)
-                cross_val_combined_results_df = pd.DataFrame(rows).set_index("model_name")
-            except Exception as e:
-                log.error(f"Creation of global stats data frame from cross-validation folds failed: {e}")
+        if cross_val_combined_rows is not None and len(cross_val_combined_rows) > 0:
+            cross_val_combined_results_df = pd.DataFrame(cross_val_combined_rows, index=pd.Index(model_names, name="model_name"))
 
         def sorted_df(df, sort_col):
             if sort_col is not None:
@@ -451,19 +520,19 @@ class ModelEvaluation(ABC, Generic[TModel, TEvaluator, TEvalData, TCrossValidato
         if use_cross_validation:
             title += ", aggregated across folds"
         sorted_results_df = sorted_df(results_df, sort_column)
-        str_results = f"{title}:\n{sorted_results_df.to_string()}"
+        result_sections = [f"{title}:\n{sorted_results_df.to_string()}"]
         if also_include_unsorted_results and sort_column is not None:
-            str_results += f"\n\n{title} (unsorted):\n{results_df.to_string()}"
+            result_sections.append(f"{title} (unsorted):\n{results_df.to_string()}")
         sorted_cross_val_combined_results_df = None
         if cross_val_combined_results_df is not None:
             sorted_cross_val_combined_results_df = sorted_df(cross_val_combined_results_df, sort_column)
-            str_results += f"\n\nModel comparison results based on combined set of data points from all folds:\n" \
-                f"{sorted_cross_val_combined_results_df.to_string()}"
-        log.info(str_results)
+            result_sections.append(f"Model comparison results based on combined set of data points from all folds:\n"
+                f"{sorted_cross_val_combined_results_df.to_string()}")
+        log.info("\n\n".join(result_sections))
         if result_writer is not None:
             suffix = "crossval" if use_cross_validation else "simple-eval"
-            str_results += "\n\n" + "\n\n".join([f"{model.get_name()} = {model.pprints()}" for model in models])
-            result_writer.write_text_file(f"model-comparison-results-{suffix}", str_results)
+            result_sections.extend(f"{model.get_name()} = {model.pprints()}" for model in models)
+            result_writer.write_text_file(f"model-comparison-results-{suffix}", "\n\n".join(result_sections))
             if write_csv:
                 result_writer.write_data_frame_csv_file(f"model-comparison-metrics-{suffix}", sorted_results_df)
                 if sorted_cross_val_combined_results_df is not None:
@@ -478,6 +547,57 @@ class ModelEvaluation(ABC, Generic[TModel, TEvaluator, TEvalData, TCrossValidato
 
         return ModelComparisonData(results_df, result_by_model_name, evaluator=evaluator, cross_validator=cross_validator)
 
+    def _evaluate_model_for_comparison(self, model: TModel, model_number: int, num_models: int, use_cross_validation: bool,
+            fit_model: bool, result_writer: Optional[ResultWriter], evaluator: Optional[TEvaluator],
+            cross_validator: Optional[TCrossValidator], tracked_experiment: Optional[TrackedExperiment], cache_path: Optional[str] = None,
+            cache_replay_only: bool = False) -> "ModelComparisonData.Result":
+        model_name = model.get_name()
+
+        def evaluate() -> ModelComparisonData.Result:
+            log.info(f"Evaluating model {model_number}/{num_models} named '{model_name}' ...")
+            if use_cross_validation:
+                cross_val_data = self.perform_cross_validation(model, result_writer=result_writer, cross_validator=cross_validator,
+                    tracked_experiment=tracked_experiment)
+                return ModelComparisonData.Result(cross_validation_data=cross_val_data)
+            else:
+                eval_data = self.perform_simple_evaluation(model, result_writer=result_writer, fit_model=fit_model, evaluator=evaluator,
+                    tracked_experiment=tracked_experiment)
+                return ModelComparisonData.Result(eval_data=eval_data)
+
+        if cache_path is None:
+            return evaluate()
+        if cache_replay_only and not os.path.exists(cache_path):
+            raise Exception(f"No cached evaluation result for model '{model_name}' found in {cache_path}")
+        return cached(evaluate, cache_path, function_name=f"evaluation of model '{model_name}'")
+
+    def _get_evaluation_cache_path(self, cache_dir: str, model: TModel, use_cross_validation: bool, fit_model: bool,
+            data_hash: str) -> str:
+        # the model is represented by its string representation, which comprises its parameters (its pickled representation
+        # is not deterministic, as it contains the instance-specific default names of components); the parameters, by contrast,
+        # consist of plain configuration values, which are pickled deterministically
+        params = self.cross_validator_params if use_cross_validation else self.evaluator_params
+        key = pickle_hash((str(model), params, use_cross_validation, fit_model, data_hash))
+        return os.path.join(cache_dir, f"{model.get_name()}-{key}.cache.pickle")
+
+    def _get_data_hash(self) -> str:
+        """
+        :return: a hash code of the data used for evaluation (covering the values and the index), which is computed only once
+            (the data is assumed not to be modified after the construction of this object)
+        """
+        if self._data_hash is None:
+            h = hashlib.sha1()
+            io_data_list = [self.io_data] if self.test_io_data is None else [self.io_data, self.test_io_data]
+            for io_data in io_data_list:
+                for df in (io_data.inputs, io_data.outputs):
+                    h.update(pickle.dumps(list(df.columns)))
+                    try:
+                        h.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+                    except TypeError:
+                        # columns containing non-hashable values (e.g. lists or arrays) cannot be hashed by pandas
+                        h.update(pickle.dumps(df))
+            self._data_hash = h.hexdigest()
+        return self._data_hash
+
     def compare_models_cross_validation(self, models: Sequence[TModel],
             result_writer: Optional[ResultWriter] = None) -> "ModelComparisonData":
         """
@@ -520,9 +640,10 @@ class ModelEvaluation(ABC, Generic[TModel, TEvaluator, TEvalData, TCrossValidato
         predicted_var_names = data.predicted_var_names
         if len(predicted_var_names) == 1:
             create_plots(predicted_var_names[0], result_collector, subtitle)
-        else:
-            for predictedVarName in predicted_var_names:
-                create_plots(predictedVarName, result_collector.child(predictedVarName + "-"), f"{predictedVarName}, {subtitle}")
+            return
+        subtitle_suffix = f", {subtitle}"
+        for predictedVarName in predicted_var_names:
+            create_plots(predictedVarName, result_collector.child(predictedVarName + "-"), predictedVarName + subtitle_suffix)
 
     def _create_eval_stats_plots(self, eval_stats: TEvalStats, result_collector: EvaluationResultCollector, subtitle=None):
         """
@@ -625,7 +746,10 @@ class MultiDataModelEvaluation:
             create_combined_eval_stats_plots=False,
             distribution_plots_cdf = True,
             distribution_plots_cdf_complementary = False,
-            visitors: Optional[Iterable["ModelComparisonVisitor"]] = None) \
+            visitors: Optional[Iterable["ModelComparisonVisitor"]] = None,
+            num_processes: int = 1,
+            low_precision_metrics: bool = False,
+            write_parquet: bool = False) \
             -> Union["RegressionMultiDataModelComparisonData", "ClassificationMultiDataModelComparisonData"]:
         """
         :param model_factories: a sequence of factory functions for the creation of models to evaluate; every factory must result
@@ -653,31 +777,36 @@ class MultiDataModelEvaluation:
             distribution_plots_cdf is True.
         :param visitors: visitors which may process individual results. Plots generated by visitors are created/collected at the end of the
             comparison.
+        :param num_processes: the number of parallel processes in which to evaluate the models on the individual data sets (use 1 to
+            process data sets sequentially in the current process). If greater than 1, the models created by the factories must be
+            picklable; visitors are applied in the current process. When combining this with parallelisation at a lower level
+            (e.g. cross-validation folds), take care not to use more processes in total than there are CPU cores.
+        :param low_precision_metrics: whether to store the metric values of the per-data set results in single precision (float32),
+            which halves the memory required for the results data frames when comparing models on a large number of data sets
+            (and correspondingly reduces the precision of all aggregations computed from them)
+        :param write_parquet: whether to additionally use result_writer (if not None) to write the data frames containing all results,
+            the mean results and the further aggregations to Parquet files (which can be read back efficiently for further analyses).
+            This requires a Parquet engine supported by pandas (pyarrow or fastparquet) to be installed.
         :return: an object containing the full comparison results
         """
         if self.test_io_data_dict and use_cross_validation:
             raise ValueError("Cannot use cross-validation when `test_io_data_dict` is specified")
 
-        all_results_df = pd.DataFrame()
-        eval_stats_by_model_name = defaultdict(list)
-        results_by_model_name: Dict[str, List[ModelComparisonData.Result]] = defaultdict(list)
+        results_dfs = []
+        results_keys = []
         is_regression = None
         plot_collector: Optional[EvalStatsPlotCollector] = None
         model_names = None
         model_name_to_string_repr = None
 
-        for i, (key, inputOutputData) in enumerate(self.io_data_dict.items(), start=1):
-            log.info(f"Evaluating models for data set #{i}/{len(self.io_data_dict)}: {self.key_name}={key}")
+        # create the models and evaluation utilities for all data sets;
+        # the model names and the model type are determined only once, based on the models created for the first data set
+        tasks = []
+        for key, inputOutputData in self.io_data_dict.items():
             models = [f() for f in model_factories]
 
-            current_model_names = [model.get_name() for model in models]
             if model_names is None:
-                model_names = current_model_names
-            elif model_names != current_model_names:
-                log.warning(f"Model factories do not produce fixed names; use model.withName to name your models. "
-                    f"Got {current_model_names}, previously got {model_names}")
-
-            if is_regression is None:
+                model_names = [model.get_name() for model in models]
                 models_are_regression = [model.is_regression_model() for model in models]
                 if all(models_are_regression):
                     is_regression = True
@@ -685,6 +814,11 @@ class MultiDataModelEvaluation:
                     is_regression = False
                 else:
                     raise ValueError("The models have to be either all regression models or all classification, not a mixture")
+            else:
+                current_model_names = [model.get_name() for model in models]
+                if model_names != current_model_names:
+                    log.warning(f"Model factories do not produce fixed names; use model.withName to name your models. "
+                        f"Got {current_model_names}, previously got {model_names}")
 
             test_io_data = self.test_io_data_dict[key] if self.test_io_data_dict is not None else None
             ev = create_evaluation_util(inputOutputData, is_regression=is_regression, evaluator_params=self.evaluator_params,
@@ -693,76 +827,135 @@ class MultiDataModelEvaluation:
             if plot_collector is None:
                 plot_collector = ev.eval_stats_plot_collector
 
-            # compute data frame with results for current data set
             if write_per_dataset_results and result_writer is not None:
                 child_result_writer = result_writer.child_for_subdirectory(key)
             else:
                 child_result_writer = None
-            comparison_data = ev.compare_models(models, use_cross_validation=use_cross_validation, result_writer=child_result_writer,
-                visitors=visitors, write_visitor_results=False)
-            df = comparison_data.results_df
-
-            # augment data frame
-            df[self.key_name] = key
-            df["model_name"] = df.index
-            df = df.reset_index(drop=True)
-
-            # collect eval stats objects by model name
-            for modelName, result in comparison_data.result_by_model_name.items():
-                if use_cross_validation:
-                    eval_stats = result.cross_validation_data.get_eval_stats_collection().get_global_stats()
-                else:
-                    eval_stats = result.eval_data.get_eval_stats()
-                eval_stats_by_model_name[modelName].append(eval_stats)
-                results_by_model_name[modelName].append(result)
-
-            all_results_df = pd.concat((all_results_df, df))
-
-            if model_name_to_string_repr is None:
-                model_name_to_string_repr = {model.get_name(): model.pprints() for model in models}
+            tasks.append((key, models, ev, child_result_writer))
+
+        # preallocate the per-model collections of results, which hold one entry per data set
+        # (the set of names is known from the first data set)
+        num_data_sets = len(tasks)
+        eval_stats_by_model_name: Dict[str, List[Optional[EvalStats]]] = {name: [None] * num_data_sets for name in model_names or []}
+        results_by_model_name: Dict[str, List[Optional[ModelComparisonData.Result]]] = \
+            {name: [None] * num_data_sets for name in model_names or []}
+
+        # compare the models on each data set
+        with ProcessPoolExecutor(max_workers=num_processes) if num_processes != 1 else contextlib.nullcontext() as executor:
+            if executor is None:
+                def iter_comparison_data():
+                    for i, (k, m, e, w) in enumerate(tasks, start=1):
+                        log.info(f"Evaluating models for data set #{i}/{len(tasks)}: {self.key_name}={k}")
+                        yield e.compare_models(m, use_cross_validation=use_cross_validation, result_writer=w, visitors=visitors,
+                            write_visitor_results=False)
+
+                comparison_data_iterator = iter_comparison_data()
+            else:
+                log.info(f"Evaluating models for {len(tasks)} data sets in {num_processes} processes")
+                futures = [executor.submit(e.compare_models, m, use_cross_validation=use_cross_validation, result_writer=w)
+                    for k, m, e, w in tasks]
+                comparison_data_iterator = (future.result() for future in futures)
+
+            for i, ((key, models, _, _), comparison_data) in enumerate(zip(tasks, comparison_data_iterator)):
+                if num_processes != 1 and visitors is not None:
+                    for model_name, result in comparison_data.result_by_model_name.items():
+                        for visitor in visitors:
+                            visitor.visit(model_name, result)
+
+                # compute data frame with results for current data set
+                df = comparison_data.results_df
+                if low_precision_metrics:
+                    float64_columns = df.select_dtypes(include="float64").columns
+                    df[float64_columns] = df[float64_columns].astype(np.float32)
+
+                # collect eval stats objects by model name
+                for modelName, result in comparison_data.result_by_model_name.items():
+                    if use_cross_validation:
+                        eval_stats = result.cross_validation_data.get_eval_stats_collection().get_global_stats()
+                    else:
+                        eval_stats = result.eval_data.get_eval_stats()
+                    if modelName not in eval_stats_by_model_name:  # model factories do not produce fixed names
+                        eval_stats_by_model_name[modelName] = [None] * num_data_sets
+                        results_by_model_name[modelName] = [None] * num_data_sets
+                    eval_stats_by_model_name[modelName][i] = eval_stats
+                    results_by_model_name[modelName][i] = result
+
+                results_dfs.append(df)
+                results_keys.append(key)
+
+                if model_name_to_string_repr is None:
+                    model_name_to_string_repr = {model.get_name(): model.pprints() for model in models}
+
+        # if the model factories did not produce fixed names, some models lack results for some data sets
+        for model_name, eval_stats_list in eval_stats_by_model_name.items():
+            if any(e is None for e in eval_stats_list):
+                eval_stats_by_model_name[model_name] = [e for e in eval_stats_list if e is not None]
+                results_by_model_name[model_name] = [r for r in results_by_model_name[model_name] if r is not None]
+
+        # concatenate the per-dataset results only once (rather than growing the data frame incrementally) and add the
+        # data set key and model name columns to the combined data frame (rather than to each per-dataset data frame)
+        if len(results_dfs) > 0:
+            results_lengths = [len(df) for df in results_dfs]
+            key_codes = np.repeat(np.arange(len(results_keys)), results_lengths)
+            all_results_df = pd.concat(results_dfs)
+            all_results_df[self.key_name] = np.array(results_keys, dtype=object)[key_codes]
+            all_results_df["model_name"] = all_results_df.index
+            all_results_df.index = np.concatenate([np.arange(n) for n in results_lengths])
+            # add the meta-data columns (left join on the data set key, using the key codes)
+            if self.meta_df is not None:
+                for column in self.meta_df.columns:
+                    all_results_df[column] = self.meta_df[column].reindex(results_keys).to_numpy()[key_codes]
+        else:
+            all_results_df = pd.DataFrame()
 
-        if self.meta_df is not None:
-            all_results_df = all_results_df.join(self.meta_df, on=self.key_name, how="left")
+        # the (potentially expensive) text representations of the results are only created if they are logged or written
+        results_text_required = result_writer is not None or log.isEnabledFor(logging.INFO)
 
-        str_all_results = f"All results:\n{all_results_df.to_string()}"
+        str_all_results = f"All results:\n{all_results_df.to_string()}" if results_text_required else ""
         log.info(str_all_results)
 
         # create mean result by model, removing any metrics/columns that produced NaN values
-        # (because the mean would be computed without them, skipna parameter unsupported)
-        all_results_grouped = all_results_df.drop(columns=self.key_name).dropna(axis=1).groupby("model_name")
-        mean_results_df: pd.DataFrame = all_results_grouped.mean()
+        # (because the mean would be computed without them, skipna parameter unsupported); the columns to retain are determined
+        # via a single NaN reduction, selecting them directly rather than constructing intermediate data frames
+        has_nan_values = all_results_df.isna().any(axis=0).to_numpy()
+        retained_columns = all_results_df.columns[~has_nan_values & (all_results_df.columns != self.key_name)]
+        # All aggregations are computed in a single pass over the groups, the mean results being taken from the aggregations
+        all_results_grouped = all_results_df[retained_columns].groupby("model_name")
+        aggs_df = all_results_grouped.agg(["mean", "std", "min", "max"])
+        mean_results_df: pd.DataFrame = aggs_df.xs("mean", axis=1, level=1)
         for colName in [column_name_for_model_ranking, f"mean[{column_name_for_model_ranking}]"]:
             if colName in mean_results_df:
-                mean_results_df.sort_values(column_name_for_model_ranking, inplace=True, ascending=not rank_max)
+                mean_results_df = mean_results_df.sort_values(column_name_for_model_ranking, ascending=not rank_max)
                 break
-        str_mean_results = f"Mean results (averaged across {len(self.io_data_dict)} data sets):\n{mean_results_df.to_string()}"
+        str_mean_results = f"Mean results (averaged across {len(self.io_data_dict)} data sets):\n{mean_results_df.to_string()}" \
+            if results_text_required else ""
         log.info(str_mean_results)
 
+        combined_eval_stats_by_model_name: Dict[str, EvalStats] = {}
+
         def iter_combined_eval_stats_from_all_data_sets():
+            # the combined eval stats are computed at most once per model (concatenating the data of all data sets)
             for model_name, evalStatsList in eval_stats_by_model_name.items():
-                if is_regression:
-                    ev_stats = RegressionEvalStatsCollection(evalStatsList).get_global_stats()
-                else:
-                    ev_stats = ClassificationEvalStatsCollection(evalStatsList).get_global_stats()
+                ev_stats = combined_eval_stats_by_model_name.get(model_name)
+                if ev_stats is None:
+                    if is_regression:
+                        ev_stats = RegressionEvalStatsCollection(evalStatsList).get_global_stats()
+                    else:
+                        ev_stats = ClassificationEvalStatsCollection(evalStatsList).get_global_stats()
+                    combined_eval_stats_by_model_name[model_name] = ev_stats
                 yield model_name, ev_stats
 
-        # create further aggregations
-        agg_dfs = []
-        for op_name, agg_fn in [("mean", lambda x: x.mean()), ("std", lambda x: x.std()), ("min", lambda x: x.min()),
-                ("max", lambda x: x.max())]:
-            agg_df = agg_fn(all_results_grouped)
-            agg_df.columns = [f"{op_name}[{c}]" for c in agg_df.columns]
-            agg_dfs.append(agg_df)
-        further_aggs_df = pd.concat(agg_dfs, axis=1)
-        further_aggs_df = further_aggs_df.loc[mean_results_df.index]  # apply same sort order (index is model_name)
-        column_order = functools.reduce(lambda a, b: a + b, [list(t) for t in zip(*[df.columns for df in agg_dfs])])
-        further_aggs_df = further_aggs_df[column_order]
-        str_further_aggs = f"Further aggregations:\n{further_aggs_df.to_string()}"
+        # create further aggregations (from the aggregations computed above), naming columns "<op>[<column>]"
+        further_aggs_df = aggs_df
+        further_aggs_df.columns = [f"{op_name}[{c}]" for c, op_name in further_aggs_df.columns]
+        if not further_aggs_df.index.equals(mean_results_df.index):  # apply same sort order (index is model_name) if it differs
+            further_aggs_df = further_aggs_df.take(further_aggs_df.index.get_indexer(mean_results_df.index))
+        str_further_aggs = f"Further aggregations:\n{further_aggs_df.to_string()}" if results_text_required else ""
         log.info(str_further_aggs)
 
         # combined eval stats from all datasets (per model)
         str_combined_eval_stats = ""
-        if add_combined_eval_stats:
+        if add_combined_eval_stats and results_text_required:
             rows = []
             for modelName, eval_stats in iter_combined_eval_stats_from_all_data_sets():
                 rows.append({"model_name": modelName, **eval_stats.metrics_dict()})
@@ -773,24 +966,29 @@ class MultiDataModelEvaluation:
             log.info(str_combined_eval_stats)
 
         if result_writer is not None:
-            comparison_content = str_mean_results + "\n\n" + str_further_aggs + "\n\n" + str_combined_eval_stats + str_all_results
-            comparison_content += "\n\nModels [example instance]:\n\n"
-            comparison_content += "\n\n".join(f"{name} = {s}" for name, s in model_name_to_string_repr.items())
-            result_writer.write_text_file("model-comparison-results", comparison_content)
+            # write the (potentially large) sections consecutively rather than concatenating them
+            comparison_content_parts = [str_mean_results, "\n\n", str_further_aggs, "\n\n", str_combined_eval_stats, str_all_results,
+                "\n\nModels [example instance]:\n\n",
+                "\n\n".join(f"{name} = {s}" for name, s in model_name_to_string_repr.items())]
+            result_writer.write_text_file_parts("model-comparison-results", comparison_content_parts)
             if write_csvs:
                 result_writer.write_data_frame_csv_file("all-results", all_results_df)
                 result_writer.write_data_frame_csv_file("mean-results", mean_results_df)
+            if write_parquet:
+                result_writer.write_data_frame_parquet_file("all-results", all_results_df)
+                result_writer.write_data_frame_parquet_file("mean-results", mean_results_df)
+                result_writer.write_data_frame_parquet_file("further-aggregations", further_aggs_df)
 
         # create plots from combined data for each model
+        # (using a single collector, whose writer threads are shared by the per-model child collectors)
         if create_combined_eval_stats_plots:
+            result_collector = EvaluationResultCollector(show_plots=False, result_writer=result_writer)
             for modelName, eval_stats in iter_combined_eval_stats_from_all_data_sets():
-                child_result_writer = result_writer.child_with_added_prefix(modelName + "_") if result_writer is not None else None
-                result_collector = EvaluationResultCollector(show_plots=False, result_writer=child_result_writer)
-                plot_collector.create_plots(eval_stats, subtitle=modelName, result_collector=result_collector)
+                plot_collector.create_plots(eval_stats, subtitle=modelName, result_collector=result_collector.child(modelName + "_"))
 
         # collect results from visitors (if any)
-        result_collector = EvaluationResultCollector(show_plots=False, result_writer=result_writer)
         if visitors is not None:
+            result_collector = EvaluationResultCollector(show_plots=False, result_writer=result_writer)
             for visitor in visitors:
                 visitor.collect_results(result_collector)
 
@@ -823,6 +1021,13 @@ class ModelComparisonData:
             if self.cross_validation_data is not None:
                 yield from self.cross_validation_data.eval_data_list
 
+        def release_predictions(self):
+            """
+            Releases the predictions and ground truth values of all evaluation data, retaining only the metrics
+            """
+            for eval_data in self.iter_evaluation_data():
+                eval_data.release_predictions()
+
     def __init__(self, results_df: pd.DataFrame, results_by_model_name: Dict[str, Result], evaluator: Optional[VectorModelEvaluator] = None,
             cross_validator: Optional[VectorModelCrossValidator] = None):
         self.results_df = results_df
@@ -874,16 +1079,17 @@ class ModelComparisonVisitorAggregatedFeatureImportance(ModelComparisonVisitor):
         self.write_data_frame_csv = write_data_frame_csv
 
     def visit(self, model_name: str, result: ModelComparisonData.Result):
-        if model_name == self.model_name:
-            if result.cross_validation_data is not None:
-                models = result.cross_validation_data.trained_models
-                if models is not None:
-                    for model in models:
-                        self._collect(model)
-                else:
-                    raise ValueError("Models were not returned in cross-validation results")
-            elif result.eval_data is not None:
-                self._collect(result.eval_data.model)
+        if model_name != self.model_name:
+            return
+        if result.cross_validation_data is not None:
+            models = result.cross_validation_data.trained_models
+            if models is not None:
+                for model in models:
+                    self._collect(model)
+            else:
+                raise ValueError("Models were not returned in cross-validation results")
+        elif result.eval_data is not None:
+            self._collect(result.eval_data.model)
 
     def _collect(self, model: Union[FeatureImportanceProvider, VectorModelBase]):
         if not isinstance(model, FeatureImportanceProvider):
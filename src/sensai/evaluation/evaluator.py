@@ -1,8 +1,14 @@
+import copy
 import functools
 import logging
+import weakref
 from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 from typing import Tuple, Dict, Any, Generator, Generic, TypeVar, Sequence, Optional, List, Union, Callable
 
+import numpy as np
 import pandas as pd
 
 from .eval_stats import GUESS
@@ -13,6 +19,7 @@ from ..data import DataSplitter, DataSplitterFractional, InputOutputData
 from ..data_transformation import DataFrameTransformer
 from ..tracking import TrackingMixin, TrackedExperiment
 from ..util.deprecation import deprecated
+from ..util.pickle import setstate
 from ..util.string import ToStringMixin
 from ..util.typing import PandasNamedTuple
 from ..vector_model import VectorClassificationModel, VectorModel, VectorModelBase, VectorModelFittableBase, VectorRegressionModel
@@ -47,9 +54,36 @@ class MetricsDictProvider(TrackingMixin, ABC):
         :return: a dictionary with metrics values
         """
         values_dict = self._compute_metrics(model, **kwargs)
+        self._track_metrics(model, values_dict)
+        return values_dict
+
+    def _track_metrics(self, model, values_dict: Dict[str, float]):
         if self.tracked_experiment is not None:
             self.tracked_experiment.track_values(values_dict, add_values_dict={"str(model)": str(model)})  # TODO strings unsupported (mlflow)
-        return values_dict
+
+    def compute_metrics_batch(self, models: Sequence, num_processes: int = 1, **kwargs) -> List[Optional[Dict[str, float]]]:
+        """
+        Computes metrics for each of the given models (see :meth:`compute_metrics`).
+        Implementations may share the preparation of the data (e.g. the transformation of ground truth values) between
+        the models.
+
+        :param models: the models for which to compute metrics
+        :param num_processes: the number of parallel processes in which to compute the metrics (use 1 to compute them sequentially
+            in the current process). If greater than 1, this object and the models must be picklable, and the models will not be
+            modified (e.g. fitted) in the current process; metrics are tracked in the current process.
+        :param kwargs: parameters to pass on to the underlying evaluation method
+        :return: a list containing, for each model, the dictionary with metrics values
+        """
+        if num_processes == 1 or len(models) <= 1:
+            return [self.compute_metrics(model, **kwargs) for model in models]
+        results = []
+        with ProcessPoolExecutor(max_workers=num_processes) as executor:
+            futures = [executor.submit(self._compute_metrics, model, **kwargs) for model in models]
+            for model, future in zip(models, futures):
+                values_dict = future.result()
+                self._track_metrics(model, values_dict)
+                results.append(values_dict)
+        return results
 
 
 class MetricsDictProviderFromFunction(MetricsDictProvider):
@@ -99,19 +133,43 @@ class VectorModelEvaluationData(ABC, Generic[TEvalStats]):
 
         :return: a DataFrame containing evaluation metrics
         """
-        stats_dicts = []
+        # collect the metric values column-wise, such that the data frame need not be constructed from a list of dictionaries
+        num_vars = len(self.eval_stats_by_var_name)
+        columns: Dict[str, List[float]] = defaultdict(lambda: [np.nan] * num_vars)
         var_names = []
-        for predictedVarName, evalStats in self.eval_stats_by_var_name.items():
-            stats_dicts.append(evalStats.metrics_dict())
+        for i, (predictedVarName, evalStats) in enumerate(self.eval_stats_by_var_name.items()):
+            for metric_name, value in evalStats.metrics_dict().items():
+                columns[metric_name][i] = value
             var_names.append(predictedVarName)
-        df = pd.DataFrame(stats_dicts, index=var_names)
+        df = pd.DataFrame(columns, index=var_names)
         df.index.name = "predictedVar"
         return df
 
     def iter_input_output_ground_truth_tuples(self, predicted_var_name=None) -> Generator[Tuple[PandasNamedTuple, Any, Any], None, None]:
         eval_stats = self.get_eval_stats(predicted_var_name)
-        for i, named_tuple in enumerate(self.input_data.itertuples()):
-            yield named_tuple, eval_stats.y_predicted[i], eval_stats.y_true[i]
+        yield from zip(self.input_data.itertuples(), eval_stats.y_predicted, eval_stats.y_true)
+
+    def apply_per_sample(self, kernel: Callable[[np.ndarray, np.ndarray], np.ndarray], predicted_var_name=None) -> np.ndarray:
+        """
+        Applies a function which computes per-sample values (e.g. residuals or losses) to the arrays of predicted and ground truth
+        values, avoiding the iteration over individual tuples (see :meth:`iter_input_output_ground_truth_tuples`).
+        The function should be vectorised (using numpy operations) or otherwise compiled (e.g. using numba) for efficiency.
+
+        :param kernel: a function which maps the (read-only) arrays of predicted and ground truth values to an array of
+            per-sample values
+        :param predicted_var_name: the name of the predicted variable; may be None only if there is but a single predicted variable
+        :return: the array returned by the kernel
+        """
+        y_true, y_predicted = self.get_eval_stats(predicted_var_name).get_value_arrays()
+        return kernel(y_predicted, y_true)
+
+    def release_predictions(self):
+        """
+        Releases the predictions and ground truth values held by the evaluation statistics objects in order to save memory,
+        retaining only the metrics (see :meth:`PredictionEvalStats.release_values`)
+        """
+        for eval_stats in self.eval_stats_by_var_name.values():
+            eval_stats.release_values()
 
 
 class VectorRegressionModelEvaluationData(VectorModelEvaluationData[RegressionEvalStats]):
@@ -139,6 +197,16 @@ class EvaluatorParams(ToStringMixin, ABC):
         self._fractionalSplitTestFraction = fractional_split_test_fraction
         self._fractionalSplitRandomSeed = fractional_split_random_seed
         self._fractionalSplitShuffle = fractional_split_shuffle
+        self._splitCache: "weakref.WeakKeyDictionary[InputOutputData, tuple]" = weakref.WeakKeyDictionary()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_splitCache"]
+        return state
+
+    def __setstate__(self, state):
+        state["_splitCache"] = weakref.WeakKeyDictionary()
+        self.__dict__ = state
 
     def _tostring_exclude_private(self) -> bool:
         return True
@@ -164,8 +232,39 @@ class EvaluatorParams(ToStringMixin, ABC):
     def set_data_splitter(self, splitter: DataSplitter):
         self._dataSplitter = splitter
 
+    def split_data(self, data: InputOutputData) -> Tuple[InputOutputData, InputOutputData]:
+        """
+        Splits the given data into training and test data using this object's data splitter.
+        If the splitter is deterministic (fractional split), the split is cached, such that evaluators which are constructed
+        repeatedly for the same data (e.g. in hyperparameter optimisation) reuse it.
+        The cache is invalidated if the data's inputs or outputs are replaced; in-place modifications of the data frames are
+        not detected (use :meth:`clear_split_cache` in such cases).
+
+        :param data: the data to split
+        :return: a pair (training data, test data)
+        """
+        data_splitter = self.get_data_splitter()
+        if not isinstance(data_splitter, DataSplitterFractional) or not isinstance(data, InputOutputData):
+            return data_splitter.split(data)
+        cached = self._splitCache.get(data)
+        if cached is not None:
+            cached_splitter, inputs, outputs, split = cached
+            if cached_splitter is data_splitter and inputs is data.inputs and outputs is data.outputs:
+                return split
+        split = data_splitter.split(data)
+        self._splitCache[data] = (data_splitter, data.inputs, data.outputs, split)
+        return split
+
+    def clear_split_cache(self):
+        """
+        Clears the cache of data splits (see :meth:`split_data`)
+        """
+        self._splitCache = weakref.WeakKeyDictionary()
+
 
 class VectorModelEvaluator(MetricsDictProvider, Generic[TEvalData], ABC):
+    OUTPUTS_CACHE_SIZE = 4
+
     def __init__(self, data: InputOutputData, test_data: InputOutputData = None, params: EvaluatorParams = None):
         """
         Constructs an evaluator with test and training data.
@@ -178,13 +277,55 @@ class VectorModelEvaluator(MetricsDictProvider, Generic[TEvalData], ABC):
             if params is None:
                 raise ValueError("Parameters required for data split must be provided")
             data_splitter = params.get_data_splitter()
-            self.training_data, self.test_data = data_splitter.split(data)
+            self.training_data, self.test_data = params.split_data(data)
             log.debug(f"{data_splitter} created split with {len(self.training_data)} "
                 f"({100 * len(self.training_data) / len(data):.2f}%) and "
                 f"{len(self.test_data)} ({100 * len(self.test_data) / len(data):.2f}%) training and test data points respectively")
         else:
             self.training_data = data
             self.test_data = test_data
+        self._fitted_input_preprocessors: Optional[Dict[str, tuple]] = None
+        # if caching is enabled, outputs computed for the most recently used (model, data set) pairs, mapping from the pair of ids
+        # to a triple (model, data set, outputs), such that subsequent calls to compute_test_data_outputs and eval_model need
+        # not predict twice
+        self._outputs_cache: "Optional[OrderedDict[Tuple[int, int], tuple]]" = None
+
+    def set_input_preprocessor_sharing(self, enabled: bool):
+        """
+        Enables or disables the sharing of fitted input preprocessors between the models fitted by this evaluator:
+        If enabled, a model whose input preprocessing configuration (see :meth:`VectorModel.get_input_preprocessing_description`)
+        is equal to the one of a model previously fitted by this evaluator will not fit its input preprocessors but will use copies
+        of the ones fitted previously (on the same training data).
+        Note that this relies on the string representations of the preprocessors fully reflecting their configuration; feature
+        generators should furthermore be named explicitly, as default names are unique to each instance.
+        Disabling the sharing clears all stored preprocessors.
+
+        :param enabled: whether to enable the sharing
+        """
+        self._fitted_input_preprocessors = {} if enabled else None
+
+    def set_outputs_caching(self, enabled: bool):
+        """
+        Enables or disables the caching of model outputs: If enabled, the outputs computed for the most recently used
+        (model, data set) pairs are retained, such that, for instance, a call to `eval_model` following a call to
+        `compute_test_data_outputs` for the same model need not apply the model again.
+        Note that the cache holds references to the models, data sets and outputs and that modifications of a model which are
+        applied by means other than this evaluator's `fit_model` method are not detected (use :meth:`clear_outputs_cache`
+        in such cases).
+        Disabling the caching clears all cached outputs.
+
+        :param enabled: whether to enable the caching
+        """
+        self._outputs_cache = OrderedDict() if enabled else None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if state["_outputs_cache"] is not None:
+            state["_outputs_cache"] = OrderedDict()
+        return state
+
+    def __setstate__(self, state):
+        setstate(VectorModelEvaluator, self, state, new_optional_properties=["_fitted_input_preprocessors", "_outputs_cache"])
 
     def set_tracked_experiment(self, tracked_experiment: TrackedExperiment):
         """
@@ -212,16 +353,54 @@ class VectorModelEvaluator(MetricsDictProvider, Generic[TEvalData], ABC):
             if fit:
                 self.fit_model(model)
             result: VectorModelEvaluationData = self._eval_model(model, data)
-            is_multiple_pred_vars = len(result.predicted_var_names) > 1
-            for pred_var_name in result.predicted_var_names:
-                metrics = result.get_eval_stats(pred_var_name).metrics_dict()
-                trackingContext.track_metrics(metrics, pred_var_name if is_multiple_pred_vars else None)
+            # metrics are computed lazily by the evaluation stats objects, so we compute them here only if they are to be tracked
+            if trackingContext.is_enabled():
+                is_multiple_pred_vars = len(result.predicted_var_names) > 1
+                for pred_var_name in result.predicted_var_names:
+                    metrics = result.get_eval_stats(pred_var_name).metrics_dict()
+                    trackingContext.track_metrics(metrics, pred_var_name if is_multiple_pred_vars else None)
         return result
 
     @abstractmethod
     def _eval_model(self, model: VectorModelBase, data: InputOutputData) -> TEvalData:
         pass
 
+    @abstractmethod
+    def _compute_outputs(self, model: VectorModelBase, io_data: InputOutputData) -> tuple:
+        pass
+
+    def _get_outputs(self, model: VectorModelBase, io_data: InputOutputData) -> tuple:
+        """
+        Gets the outputs of the given model for the given data set (as computed by :meth:`_compute_outputs`).
+        If outputs caching is enabled (see :meth:`set_outputs_caching`), the outputs of a previous call for the same model and
+        data set are reused unless the model was fitted by this evaluator in the meantime.
+
+        :param model: the model to apply
+        :param io_data: the data set
+        :return: the outputs
+        """
+        if self._outputs_cache is None:
+            return self._compute_outputs(model, io_data)
+        key = (id(model), id(io_data))
+        cached = self._outputs_cache.get(key)
+        if cached is not None and cached[0] is model and cached[1] is io_data:
+            self._outputs_cache.move_to_end(key)
+            return cached[2]
+        outputs = self._compute_outputs(model, io_data)
+        self._outputs_cache[key] = (model, io_data, outputs)
+        if len(self._outputs_cache) > self.OUTPUTS_CACHE_SIZE:
+            self._outputs_cache.popitem(last=False)
+        return outputs
+
+    def clear_outputs_cache(self):
+        """
+        Clears the cache of model outputs, which is required if a model that was previously evaluated by this evaluator
+        is modified by means other than this evaluator's `fit_model` method and shall be re-evaluated
+        (applies only if outputs caching is enabled, see :meth:`set_outputs_caching`)
+        """
+        if self._outputs_cache is not None:
+            self._outputs_cache.clear()
+
     def _compute_metrics(self, model: VectorModel, on_training_data=False) -> Dict[str, float]:
         return self._compute_metrics_for_var_name(model, None, on_training_data=on_training_data)
 
@@ -245,7 +424,19 @@ class VectorModelEvaluator(MetricsDictProvider, Generic[TEvalData], ABC):
         """Fits the given model's parameters using this evaluator's training data"""
         if self.training_data is None:
             raise Exception(f"Cannot fit model with evaluator {self.__class__.__name__}: no training data provided")
-        model.fit(self.training_data.inputs, self.training_data.outputs)
+        self.clear_outputs_cache()
+        if self._fitted_input_preprocessors is not None and isinstance(model, VectorModel) and model.has_input_preprocessors():
+            preprocessing_description = model.get_input_preprocessing_description()
+            fitted_preprocessors = self._fitted_input_preprocessors.get(preprocessing_description)
+            if fitted_preprocessors is not None:
+                log.info(f"Using previously fitted input preprocessors for {model.get_name()}")
+                model.set_input_preprocessors(*copy.deepcopy(fitted_preprocessors))
+                model.fit(self.training_data.inputs, self.training_data.outputs, fit_preprocessors=False)
+            else:
+                model.fit(self.training_data.inputs, self.training_data.outputs)
+                self._fitted_input_preprocessors[preprocessing_description] = copy.deepcopy(model.get_input_preprocessors())
+        else:
+            model.fit(self.training_data.inputs, self.training_data.outputs)
 
 
 class RegressionEvaluatorParams(EvaluatorParams):
@@ -282,12 +473,12 @@ class RegressionEvaluatorParams(EvaluatorParams):
     @classmethod
     def from_dict_or_instance(cls,
             params: Optional[Union[Dict[str, Any], "RegressionEvaluatorParams"]]) -> "RegressionEvaluatorParams":
-        if params is None:
+        if isinstance(params, cls):
+            return params
+        elif params is None:
             return RegressionEvaluatorParams()
-        elif type(params) == dict:
+        elif isinstance(params, Mapping):
             raise Exception("Old-style dictionary parametrisation is no longer supported")
-        elif isinstance(params, cls):
-            return params
         else:
             raise ValueError(f"Must provide dictionary or {cls} instance, got {params}, type {type(params)}")
 
@@ -310,23 +501,38 @@ class VectorRegressionModelEvaluator(VectorModelEvaluator[VectorRegressionModelE
         """
         super().__init__(data=data, test_data=test_data, params=params)
         self.params = params
+        # transformed ground truth data frames (if an output data frame transformer is used) for this evaluator's training and test
+        # data sets, mapping from the id of the data set to a tuple (data set, outputs, transformer, transformed ground truth), such that
+        # the transformation is applied only once for each of these data sets
+        self._transformed_ground_truth_cache: Dict[int, Tuple[InputOutputData, pd.DataFrame, Any, pd.DataFrame]] = {}
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state["_transformed_ground_truth_cache"] = {}
+        return state
+
+    def __setstate__(self, state):
+        setstate(VectorRegressionModelEvaluator, self, state, new_default_properties={"_transformed_ground_truth_cache": {}})
 
     def _eval_model(self, model: VectorRegressionModel, data: InputOutputData) -> VectorRegressionModelEvaluationData:
         if not model.is_regression_model():
             raise ValueError(f"Expected a regression model, got {model}")
         eval_stats_by_var_name = {}
-        predictions, ground_truth = self._compute_outputs(model, data)
-        for predictedVarName in predictions.columns:
+        predictions, ground_truth = self._get_outputs(model, data)
+        # convert the data frames to arrays only once, passing column slices to the eval stats objects
+        predictions_array = predictions.to_numpy()
+        ground_truth_array = ground_truth.to_numpy()
+        for i, predictedVarName in enumerate(predictions.columns):
             if predictedVarName in ground_truth.columns:
-                y_true = ground_truth[predictedVarName]
+                y_true = ground_truth_array[:, ground_truth.columns.get_loc(predictedVarName)]
             else:
                 if len(predictions.columns) == 1 and len(ground_truth.columns) == 1:
                     log.warning(f"Model output column '{predictedVarName}' does not match ground truth column '{ground_truth.columns[0]}'; "
                         f"assuming that this is not a problem since there is but a single column available")
-                    y_true = ground_truth.iloc[:, 0]
+                    y_true = ground_truth_array[:, 0]
                 else:
                     raise Exception(f"Model output column '{predictedVarName}' not found in ground truth columns {ground_truth.columns}")
-            eval_stats = RegressionEvalStats(y_predicted=predictions[predictedVarName], y_true=y_true,
+            eval_stats = RegressionEvalStats(y_predicted=predictions_array[:, i], y_true=y_true,
                 metrics=self.params.metrics,
                 additional_metrics=self.params.additional_metrics,
                 model=model,
@@ -341,7 +547,7 @@ class VectorRegressionModelEvaluator(VectorModelEvaluator[VectorRegressionModelE
         :param model: the model to apply
         :return: a pair (predictions, groundTruth)
         """
-        return self._compute_outputs(model, self.test_data)
+        return self._get_outputs(model, self.test_data)
 
     def _compute_outputs(self, model: VectorModelBase, io_data: InputOutputData):
         """
@@ -355,9 +561,23 @@ class VectorRegressionModelEvaluator(VectorModelEvaluator[VectorRegressionModelE
         ground_truth = io_data.outputs
         if self.params.output_data_frame_transformer:
             predictions = self.params.output_data_frame_transformer.apply(predictions)
-            ground_truth = self.params.output_data_frame_transformer.apply(ground_truth)
+            ground_truth = self._get_transformed_ground_truth(io_data)
         return predictions, ground_truth
 
+    def _get_transformed_ground_truth(self, io_data: InputOutputData) -> pd.DataFrame:
+        transformer = self.params.output_data_frame_transformer
+        # only the evaluator's own data sets are cached (which are referenced by the evaluator anyway)
+        if io_data is not self.test_data and io_data is not self.training_data:
+            return transformer.apply(io_data.outputs)
+        cached = self._transformed_ground_truth_cache.get(id(io_data))
+        if cached is not None:
+            cached_io_data, cached_outputs, cached_transformer, ground_truth = cached
+            if cached_io_data is io_data and cached_outputs is io_data.outputs and cached_transformer is transformer:
+                return ground_truth
+        ground_truth = transformer.apply(io_data.outputs)
+        self._transformed_ground_truth_cache[id(io_data)] = (io_data, io_data.outputs, transformer, ground_truth)
+        return ground_truth
+
 
 class VectorClassificationModelEvaluationData(VectorModelEvaluationData[ClassificationEvalStats]):
     def get_misclassified_inputs_data_frame(self) -> pd.DataFrame:
@@ -403,12 +623,12 @@ class ClassificationEvaluatorParams(EvaluatorParams):
     def from_dict_or_instance(cls,
             params: Optional[Union[Dict[str, Any], "ClassificationEvaluatorParams"]]) \
             -> "ClassificationEvaluatorParams":
-        if params is None:
+        if isinstance(params, ClassificationEvaluatorParams):
+            return params
+        elif params is None:
             return ClassificationEvaluatorParams()
-        elif type(params) == dict:
+        elif isinstance(params, Mapping):
             raise ValueError("Old-style dictionary parametrisation is no longer supported")
-        elif isinstance(params, ClassificationEvaluatorParams):
-            return params
         else:
             raise ValueError(f"Must provide dictionary or instance, got {params}")
 
@@ -437,7 +657,7 @@ class VectorClassificationModelEvaluator(VectorModelEvaluator[VectorClassificati
     def _eval_model(self, model: VectorClassificationModel, data: InputOutputData) -> VectorClassificationModelEvaluationData:
         if model.is_regression_model():
             raise ValueError(f"Expected a classification model, got {model}")
-        predictions, predictions_proba, ground_truth = self._compute_outputs(model, data)
+        predictions, predictions_proba, ground_truth = self._get_outputs(model, data)
         eval_stats = ClassificationEvalStats(
             y_predicted_class_probabilities=predictions_proba,
             y_predicted=predictions,
@@ -455,7 +675,7 @@ class VectorClassificationModelEvaluator(VectorModelEvaluator[VectorClassificati
         :param model: the model to apply
         :return: a triple (predictions, predicted class probability vectors, groundTruth) of DataFrames
         """
-        return self._compute_outputs(model, self.test_data)
+        return self._get_outputs(model, self.test_data)
 
     def _compute_outputs(self, model, io_data: InputOutputData) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
         """
@@ -490,12 +710,13 @@ class RuleBasedVectorClassificationModelEvaluator(VectorClassificationModelEvalu
         :param on_training_data: has to be False here. Setting to True is not supported and will lead to an
             exception
         :param track: whether to track the evaluation metrics for the case where a tracked experiment was set on this object
+        :param fit: whether to fit the model (i.e. its preprocessors) on the data set before evaluating it
         :return: the evaluation result
         """
         if on_training_data:
             raise Exception("Evaluating rule based models on training data is not supported. In this evaluator"
                             "training and test data coincide.")
-        return super().eval_model(model)
+        return super().eval_model(model, track=track, fit=fit)
 
 
 class RuleBasedVectorRegressionModelEvaluator(VectorRegressionModelEvaluator):
@@ -513,9 +734,10 @@ class RuleBasedVectorRegressionModelEvaluator(VectorRegressionModelEvaluator):
         :param on_training_data: has to be False here. Setting to True is not supported and will lead to an
             exception
         :param track: whether to track the evaluation metrics for the case where a tracked experiment was set on this object
+        :param fit: whether to fit the model (i.e. its preprocessors) on the data set before evaluating it
         :return: the evaluation result
         """
         if on_training_data:
             raise Exception("Evaluating rule based models on training data is not supported. In this evaluator"
                             "training and test data coincide.")
-        return super().eval_model(model)
+        return super().eval_model(model, track=track, fit=fit)
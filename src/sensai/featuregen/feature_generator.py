@@ -1,4 +1,4 @@
-import functools
+import itertools
 import logging
 import re
 from abc import ABC, abstractmethod
@@ -387,7 +387,7 @@ class MultiFeatureGenerator(FeatureGenerator):
         return info
 
     def get_names(self) -> list:
-        return functools.reduce(lambda x, y: x + y, [fg.get_names() for fg in self.featureGenerators], [])
+        return list(itertools.chain.from_iterable(fg.get_names() for fg in self.featureGenerators))
 
 
 class FeatureGeneratorFromNamedTuples(FeatureGenerator, ABC):
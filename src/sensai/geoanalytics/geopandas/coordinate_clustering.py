@@ -1,17 +1,21 @@
 import logging
-from typing import Callable, Union, Iterable
+from typing import Callable, Union, Iterable, Optional
 
 import geopandas as gp
 import numpy as np
 import pandas as pd
+import shapely
 from shapely.geometry import MultiPoint
 
-from .coordinates import validate_coordinates, extract_coordinates_array, TCoordinates, GeoDataFrameWrapper
+from .coordinates import validate_coordinates, extract_coordinates_array, TCoordinates, GeoDataFrameWrapper, \
+    multipoint_to_array
 from ...clustering import SkLearnEuclideanClusterer
 from ...clustering.clustering_base import EuclideanClusterer
 from ...clustering.sklearn_clustering import SkLearnClustererProtocol
 from ...util.cache import LoadSaveInterface
+from ...util.pickle import setstate
 from ...util.profiling import timed
+from ...util.version import Version
 
 log = logging.getLogger(__name__)
 
@@ -22,12 +26,20 @@ class CoordinateEuclideanClusterer(EuclideanClusterer, GeoDataFrameWrapper):
     clusterer
 
     :param clusterer: an instance of ClusteringModel
+    :param coordinate_dtype: if not None, the dtype to which coordinates are converted when fitting. Using np.float32
+        halves the memory footprint of large point sets; its precision of about 7 significant digits corresponds to
+        sub-metre resolution for projected coordinates at city scale but may be insufficient at continental scale.
+        If None, the coordinates are used as given
     """
-    def __init__(self, clusterer: EuclideanClusterer):
+    def __init__(self, clusterer: EuclideanClusterer, coordinate_dtype: Optional[np.dtype] = None):
         self.clusterer = clusterer
+        self.coordinateDtype = coordinate_dtype
         super().__init__(noise_label=clusterer.noiseLabel,
             max_cluster_size=clusterer.maxClusterSize, min_cluster_size=clusterer.minClusterSize)
 
+    def __setstate__(self, state):
+        setstate(CoordinateEuclideanClusterer, self, state, new_optional_properties=["coordinateDtype"])
+
     class Cluster(EuclideanClusterer.Cluster, GeoDataFrameWrapper, LoadSaveInterface):
         """
         Wrapper around a coordinates array
@@ -73,7 +85,7 @@ class CoordinateEuclideanClusterer(EuclideanClusterer, GeoDataFrameWrapper):
             if len(gdf) != 1:
                 raise Exception(f"Expected {path} to contain a single row, instead got {len(gdf)}")
             identifier, multipoint = gdf.identifier.values[0], gdf.geometry.values[0]
-            return cls(np.array([[p.x, p.y] for p in multipoint]), identifier)
+            return cls(multipoint_to_array(multipoint), identifier)
 
         def save(self, path, crs="EPSG:3857"):
             """
@@ -98,6 +110,8 @@ class CoordinateEuclideanClusterer(EuclideanClusterer, GeoDataFrameWrapper):
         :return:
         """
         coordinates = extract_coordinates_array(coordinates)
+        if self.coordinateDtype is not None:
+            coordinates = np.ascontiguousarray(coordinates, dtype=self.coordinateDtype)
         super().fit(coordinates)
 
     @timed
@@ -112,13 +126,22 @@ class CoordinateEuclideanClusterer(EuclideanClusterer, GeoDataFrameWrapper):
         :param include_noise:
         :return: GeoDataFrame with all clusters indexed by their identifier
         """
-        geodf = gp.GeoDataFrame()
-        geodf.crs = crs
-        for cluster in self.clusters(condition):
-            geodf = pd.concat((geodf, cluster.to_geodf(crs=crs)))
+        return self._build_clusters_geodf(condition, crs, include_noise)
+
+    def _build_clusters_geodf(self, condition: Optional[Callable[[Cluster], bool]], crs, include_noise: bool) \
+            -> gp.GeoDataFrame:
+        clusters = list(self.clusters(condition))
         if include_noise:
-            geodf = pd.concat((geodf, self.noise_cluster().to_geodf(crs=crs)))
-        return geodf
+            clusters.append(self.noise_cluster())
+        if Version(shapely).is_at_least(2) and len(clusters) > 0:
+            # construct all MultiPoint geometries in a single vectorised call
+            coordinates = np.concatenate([cluster.datapoints for cluster in clusters])
+            indices = np.repeat(np.arange(len(clusters)), [len(cluster) for cluster in clusters])
+            geometries = shapely.multipoints(coordinates, indices=indices)
+        else:
+            geometries = [cluster.as_multipoint() for cluster in clusters]
+        index = pd.Index([cluster.identifier for cluster in clusters], name="identifier")
+        return gp.GeoDataFrame({"geometry": geometries}, index=index, crs=crs)
 
     def plot(self, include_noise=False, condition=None, **kwargs):
         """
@@ -130,10 +153,10 @@ class CoordinateEuclideanClusterer(EuclideanClusterer, GeoDataFrameWrapper):
         :return:
         """
         geodf = self.to_geodf(condition=condition, include_noise=include_noise)
-        geodf["color"] = np.random.random(len(geodf))
+        colors = np.random.random(len(geodf))
         if include_noise:
-            geodf.loc[self.noiseLabel, "color"] = 0
-        geodf.plot(column="color", **kwargs)
+            colors[geodf.index.get_loc(self.noiseLabel)] = 0
+        geodf.assign(color=colors).plot(column="color", **kwargs)
 
     # the overriding of the following methods is only necessary for getting the type annotations right
     # if mypy ever permits annotating nested classes correctly, these methods can be removed
@@ -156,9 +179,11 @@ class SkLearnCoordinateClustering(CoordinateEuclideanClusterer):
     :param noise_label: label that is associated with the noise cluster or None
     :param min_cluster_size: if not None, clusters below this size will be labeled as noise
     :param max_cluster_size: if not None, clusters above this size will be labeled as noise
+    :param coordinate_dtype: if not None, the dtype to which coordinates are converted when fitting
+        (see CoordinateEuclideanClusterer)
     """
     def __init__(self, clusterer: SkLearnClustererProtocol, noise_label=-1,
-                 min_cluster_size: int = None, max_cluster_size: int = None):
+                 min_cluster_size: int = None, max_cluster_size: int = None, coordinate_dtype: Optional[np.dtype] = None):
         clusterer = SkLearnEuclideanClusterer(clusterer, noise_label=noise_label,
                            min_cluster_size=min_cluster_size, max_cluster_size=max_cluster_size)
-        super().__init__(clusterer)
+        super().__init__(clusterer, coordinate_dtype=coordinate_dtype)
@@ -88,10 +88,10 @@ class PolygonAnnotatedCoordinates(GeoDataFrameWrapper):
         :return:
         """
         gdf = self.to_geodf(include_noise=include_noise)
-        gdf["color"] = np.random.random(len(gdf))
+        colors = np.random.random(len(gdf))
         if include_noise and self.noiseLabel is not None:
-            gdf.loc[self.noiseLabel, "color"] = 0
-        gdf.plot(column="color", **kwargs)
+            colors[gdf.index.get_loc(self.noiseLabel)] = 0
+        gdf.assign(color=colors).plot(column="color", **kwargs)
 
     def get_coordinates_labels(self):
         """
@@ -1,32 +1,53 @@
 import geopandas as gp
 import numpy as np
+import shapely
 from abc import ABC, abstractmethod
 from shapely.geometry import MultiPoint
 from typing import Union
 
 from ...clustering import EuclideanClusterer
+from ...util.version import Version
 
 TCoordinates = Union[np.ndarray, MultiPoint, gp.GeoDataFrame, EuclideanClusterer.Cluster]
 
 
 def validate_coordinates(coordinates: np.ndarray):
+    """
+    Checks that the given array has shape (n, 2). Only the array's shape is inspected, i.e. the check is independent
+    of the number of points.
+
+    :param coordinates: the coordinates array
+    """
     # for the moment we only support 2-dim coordinates. We can adjust it in the future when needed
-    if not len(coordinates.shape) == 2 or coordinates.shape[1] != 2:
+    if coordinates.ndim != 2 or coordinates.shape[1] != 2:
         raise Exception(f"Coordinates must be of shape (n, 2), instead got: {coordinates.shape}")
 
 
+def multipoint_to_array(multipoint: MultiPoint) -> np.ndarray:
+    """
+    Extracts the coordinates of a MultiPoint object as a numpy array of shape (n, 2)
+
+    :param multipoint: the MultiPoint object
+    :return: the coordinates array
+    """
+    if Version(shapely).is_at_least(2):
+        # vectorised extraction, which avoids the creation of a Point object per coordinate
+        return shapely.get_coordinates(multipoint)
+    return np.array([[p.x, p.y] for p in multipoint.geoms])
+
+
 def extract_coordinates_array(coordinates: TCoordinates) -> np.ndarray:
     """
     Extract coordinates as numpy array
     """
     if isinstance(coordinates, gp.GeoDataFrame):
         try:
-            coordinates = np.array(MultiPoint(list(coordinates.geometry)))
+            coordinates = multipoint_to_array(MultiPoint(list(coordinates.geometry)))
         except Exception:
             raise ValueError(f"Could not extract coordinates from GeoDataFrame. "
                              f"Is the geometry column a sequence of Points?")
     elif isinstance(coordinates, MultiPoint):
-        coordinates = np.array(coordinates)
+        coordinates = multipoint_to_array(coordinates)
     elif isinstance(coordinates, EuclideanClusterer.Cluster):
         coordinates = coordinates.datapoints
     validate_coordinates(coordinates)
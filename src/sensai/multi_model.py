@@ -1,4 +1,4 @@
-import functools
+import itertools
 from typing import Union
 
 import pandas as pd
@@ -15,7 +15,7 @@ class MultiVectorRegressionModel(RuleBasedVectorRegressionModel):
     def __init__(self, *models: VectorRegressionModel):
         self.models = models
         predicted_variable_names_list = [m.get_predicted_variable_names() for m in models]
-        predicted_variable_names = functools.reduce(lambda x, y: x + y.get_predicted_variable_names(), models, [])
+        predicted_variable_names = list(itertools.chain.from_iterable(predicted_variable_names_list))
         if len(predicted_variable_names) != sum((len(v) for v in predicted_variable_names_list)):
             raise ValueError(f"Models do not produce disjoint outputs: {predicted_variable_names_list}")
         super().__init__(predicted_variable_names)
@@ -259,12 +259,14 @@ class TorchModel(ABC, ToStringMixin):
                     if max_value > self._normalisationCheckThreshold:
                         log.warning(f"Received value in input tensor {i} which is likely to not be correctly normalised: "
                                     f"maximum abs. value in tensor is %f" % max_value)
-        if mc_dropout_samples is None:
-            y = model(*inputs)
-            return extract(y)
-        else:
-            y, stddev = model.inferMCDropout(x, mc_dropout_samples, p=mc_dropout_probability)
-            return extract(y), extract(stddev)
+        # the results are detached anyway, so gradient tracking is disabled to avoid constructing the autograd graph
+        with torch.no_grad():
+            if mc_dropout_samples is None:
+                y = model(*inputs)
+                return extract(y)
+            else:
+                y, stddev = model.inferMCDropout(x, mc_dropout_samples, p=mc_dropout_probability)
+                return extract(y), extract(stddev)
 
     def apply_scaled(self, x: Union[torch.Tensor, np.ndarray, TorchDataSet, Sequence[torch.Tensor]],
             as_numpy: bool = True,
@@ -14,12 +14,14 @@ class ActivationFunction(Enum):
     SOFTMAX = "softmax"
 
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def from_name(cls, name: str) -> "ActivationFunction":
         for item in cls:
             if item.get_name() == name:
                 return item
         raise ValueError(f"No function found for name '{name}'")
 
+    @functools.lru_cache(maxsize=None)  # the function objects (partial applications) are created only once per member
     def get_torch_function(self) -> Optional[Callable]:
         return {
                 ActivationFunction.NONE: None,
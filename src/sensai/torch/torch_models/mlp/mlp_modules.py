@@ -36,12 +36,17 @@ class MultiLayerPerceptron(MCDropoutCapableNNModule):
             pDropout=self.pDropout))
 
     def forward(self, x):
-        for i, layer in enumerate(self.layers):
-            is_last = i+1 == len(self.layers)
-            x = layer(x)
-            if not is_last and self.dropout is not None:
-                x = self.dropout(x)
-            activation = self.hidActivationFn if not is_last else self.outputActivationFn
-            if activation is not None:
-                x = activation(x)
+        layers = self.layers
+        output_layer_index = len(layers) - 1
+        dropout = self.dropout
+        hid_activation_fn = self.hidActivationFn
+        for i in range(output_layer_index):
+            x = layers[i](x)
+            if dropout is not None:
+                x = dropout(x)
+            if hid_activation_fn is not None:
+                x = hid_activation_fn(x)
+        x = layers[output_layer_index](x)
+        if self.outputActivationFn is not None:
+            x = self.outputActivationFn(x)
         return x
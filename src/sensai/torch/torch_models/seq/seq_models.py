@@ -81,13 +81,13 @@ class EncoderDecoderVectorRegressionModel(TorchVectorRegressionModel):
         def _tensorise(self, df: pd.DataFrame) -> Union[torch.Tensor, List[torch.Tensor]]:
             log.debug(f"Applying {self} to data frame of length {len(df)} ...")
             history = df[self.history_sequence_column_name]
-            history_sequences, history_sequence_lengths = self.history_sequence_vectoriser.apply_multi_with_padding(history)
+            history_sequences, history_sequence_lengths = self.history_sequence_vectoriser.apply_multi_with_padding_array(history)
             targets = df[self.target_sequence_column_name]
-            target_sequences, target_sequence_lengths = self.target_sequence_vectoriser.apply_multi_with_padding(targets)
+            target_sequences, target_sequence_lengths = self.target_sequence_vectoriser.apply_multi_with_padding_array(targets)
             return [
-                torch.tensor(history_sequences).float(),
+                torch.from_numpy(history_sequences).float(),
                 torch.tensor(history_sequence_lengths),
-                torch.tensor(target_sequences).float(),
+                torch.from_numpy(target_sequences).float(),
                 torch.tensor(target_sequence_lengths),
             ]
 
@@ -11,7 +11,7 @@ import time
 from abc import abstractmethod, ABC
 from functools import wraps
 from pathlib import Path
-from typing import Any, Callable, Iterator, List, Optional, TypeVar, Generic, Union
+from typing import Any, Callable, Iterator, List, Optional, TypeVar, Generic, Union, Iterable, Tuple
 
 from .hash import pickle_hash
 from .pickle import load_pickle, dump_pickle, setstate
@@ -55,6 +55,28 @@ class KeyValueCache(Generic[TKey, TValue], ABC):
         """
         pass
 
+    def set_many(self, items: Iterable[Tuple[TKey, TValue]]):
+        """
+        Sets multiple cached values.
+        The default implementation calls set for each item; caches for which individual operations are costly
+        (e.g. database-backed caches) should override this method.
+
+        :param items: the key-value pairs to store
+        """
+        for key, value in items:
+            self.set(key, value)
+
+    def get_many(self, keys: Iterable[TKey]) -> List[Optional[TValue]]:
+        """
+        Retrieves multiple cached values.
+        The default implementation calls get for each key; caches for which individual operations are costly
+        (e.g. database-backed caches) should override this method.
+
+        :param keys: the lookup keys
+        :return: the list of cached values (in the order of the keys), containing None for keys for which no value is found
+        """
+        return [self.get(key) for key in keys]
+
 
 class InMemoryKeyValueCache(KeyValueCache[TKey, TValue], Generic[TKey, TValue]):
     """A simple in-memory cache (which uses a dictionary internally).
@@ -506,6 +528,19 @@ class SqlitePersistentKeyValueCache(PersistentKeyValueCache[TKey, TValue]):
 
         self._update_hook.handle_update()
 
+    def set_many(self, items: Iterable[Tuple[TKey, TValue]]):
+        rows = [(self._key_db_value(key), pickle.dumps(value)) for key, value in items]
+        self._conn_mutex.acquire()
+        try:
+            cursor = self.conn.cursor()
+            cursor.executemany(f"INSERT OR REPLACE INTO {self.table_name} (cache_key, cache_value) VALUES (?, ?)", rows)
+            self._num_entries_to_be_committed += len(rows)
+            cursor.close()
+        finally:
+            self._conn_mutex.release()
+
+        self._update_hook.handle_update()
+
     def _execute(self, cursor, *query):
         try:
             cursor.execute(*query)
@@ -526,6 +561,26 @@ class SqlitePersistentKeyValueCache(PersistentKeyValueCache[TKey, TValue]):
         finally:
             self._conn_mutex.release()
 
+    def get_many(self, keys: Iterable[TKey], max_num_keys_per_query=500) -> List[Optional[TValue]]:
+        db_keys = [self._key_db_value(key) for key in keys]
+        db_values = {}
+        self._conn_mutex.acquire()
+        try:
+            cursor = self.conn.cursor()
+            # query the keys in chunks, as the number of parameters per query is limited
+            unique_db_keys = list(dict.fromkeys(db_keys))
+            for i in range(0, len(unique_db_keys), max_num_keys_per_query):
+                chunk = unique_db_keys[i:i + max_num_keys_per_query]
+                placeholders = ",".join("?" * len(chunk))
+                self._execute(cursor, f"SELECT cache_key, cache_value FROM {self.table_name} WHERE cache_key IN ({placeholders})",
+                    chunk)
+                db_values.update(cursor.fetchall())
+            cursor.close()
+        finally:
+            self._conn_mutex.release()
+        values = {db_key: pickle.loads(db_value) for db_key, db_value in db_values.items()}
+        return [values.get(db_key) for db_key in db_keys]
+
     def __len__(self):
         self._conn_mutex.acquire()
         try:
@@ -1,7 +1,7 @@
 import io
 import logging
 import os
-from typing import Sequence, Optional, Tuple, List, Any
+from typing import Sequence, Optional, Tuple, List, Any, Iterable
 
 import matplotlib.figure
 from matplotlib import pyplot as plt
@@ -39,6 +39,12 @@ class ResultWriter:
             close_figures=self.close_figures_default)
 
     def child_for_subdirectory(self, dir_name: str) -> "ResultWriter":
+        """
+        Creates a derived result writer which writes to the given subdirectory
+
+        :param dir_name: the name of the subdirectory
+        :return: a new writer instance
+        """
         result_dir = os.path.join(self.result_dir, dir_name)
         return ResultWriter(result_dir, filename_prefix=self.filename_prefix, enabled=self.enabled,
             close_figures=self.close_figures_default)
@@ -74,6 +80,23 @@ class ResultWriter:
                 f.write(content)
         return p
 
+    def write_text_file_parts(self, filename_suffix: str, parts: Iterable[str]):
+        """
+        Writes a text file whose content is the concatenation of the given parts, writing the parts consecutively
+        (i.e. without constructing the full content in memory)
+
+        :param filename_suffix: the filename suffix
+        :param parts: the parts of the content
+        :return: the path to the file that was written (or would have been written if the writer was enabled)
+        """
+        p = self.path(filename_suffix, extension_to_add="txt")
+        if self.enabled:
+            self.log.info(f"Saving text file {p}")
+            with open(p, "w") as f:
+                for part in parts:
+                    f.write(part)
+        return p
+
     def write_text_file_lines(self, filename_suffix: str, lines: List[str]):
         p = self.path(filename_suffix, extension_to_add="txt")
         if self.enabled:
@@ -96,6 +119,21 @@ class ResultWriter:
             df.to_csv(p, index=index, header=header)
         return p
 
+    def write_data_frame_parquet_file(self, filename_suffix: str, df: pd.DataFrame):
+        """
+        Writes the given data frame to a Parquet file, which requires a Parquet engine supported by pandas (pyarrow or fastparquet)
+        to be installed
+
+        :param filename_suffix: the filename suffix, which may or may not include the file extension
+        :param df: the data frame to write
+        :return: the path to the file that was written (or would have been written if the writer was enabled)
+        """
+        p = self.path(filename_suffix, extension_to_add="parquet")
+        if self.enabled:
+            self.log.info(f"Saving data frame Parquet file {p}")
+            df.to_parquet(p)
+        return p
+
     def write_figure(self, filename_suffix: str, fig: plt.Figure, close_figure: Optional[bool] = None):
         """
         :param filename_suffix: the filename suffix, which may or may not include a file extension, valid extensions being {"png", "jpg"}
@@ -1,8 +1,9 @@
 import logging
 import os
 import pickle
+import weakref
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterable, List, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 import joblib
 
@@ -11,9 +12,26 @@ from .io import S3Object, is_s3_path
 log = logging.getLogger(__name__)
 
 
-def load_pickle(path: Union[str, Path], backend="pickle"):
+def load_pickle(path: Union[str, Path], backend="pickle", mmap_mode: Optional[str] = None):
+    """
+    Loads an object from a pickle file
+
+    :param path: the path of the file (which may be an S3 path)
+    :param backend: the backend with which the file was written ('pickle', 'joblib' or 'cloudpickle')
+    :param mmap_mode: (joblib backend only) the memory-mapping mode with which to load numpy arrays (e.g. 'r' for read-only access);
+        memory-mapped arrays are not read into memory upon loading but only when they are accessed, and they can be
+        shared by multiple processes. Memory-mapping is not supported for S3 paths.
+    :return: the loaded object
+    """
     if isinstance(path, Path):
         path = str(path)
+    if mmap_mode is not None:
+        if backend != "joblib":
+            raise ValueError(f"Memory-mapping is only supported by the joblib backend, not by '{backend}'")
+        if is_s3_path(path):
+            raise ValueError("Memory-mapping is not supported for S3 paths")
+        # memory-mapping requires joblib to open the file itself
+        return joblib.load(path, mmap_mode=mmap_mode)
 
     def read_file(f):
         def _load_with_error_log(loader: Callable):
@@ -76,10 +94,11 @@ class PickleFailureDebugger:
     enabled = False  # global flag controlling the behaviour of logFailureIfEnabled
 
     @classmethod
-    def _debug_failure(cls, obj, path, failures, handled_object_ids):
-        if id(obj) in handled_object_ids:
+    def _debug_failure(cls, obj, path, failures, handled_objects: Dict[int, Any]):
+        if id(obj) in handled_objects:
             return
-        handled_object_ids.add(id(obj))
+        # keep a reference to the object, such that its id cannot be reused by another (temporary) object during the analysis
+        handled_objects[id(obj)] = obj
 
         try:
             pickle.dumps(obj)
@@ -106,7 +125,7 @@ class PickleFailureDebugger:
             for key, child in d.items():
                 child_path = list(path) + [f"{key}[{child.__class__.__name__}]"]
                 have_failed_child = cls._debug_failure(
-                    child, child_path, failures, handled_object_ids
+                    child, child_path, failures, handled_objects
                 ) or have_failed_child
 
             if not have_failed_child:
@@ -124,9 +143,9 @@ class PickleFailureDebugger:
         :param obj: the object for which to recursively test pickling
         :return: a list of object paths that failed to pickle
         """
-        handled_object_ids = set()
+        handled_objects = {}
         failures = []
-        cls._debug_failure(obj, [obj.__class__.__name__], failures, handled_object_ids)
+        cls._debug_failure(obj, [obj.__class__.__name__], failures, handled_objects)
         return [".".join(l) for l in failures]
 
     @classmethod
@@ -151,6 +170,41 @@ class PickleFailureDebugger:
                 log.info(f"{prefix}: is picklable")
 
 
+# cache of the attributes found by _get_super_method, mapping from the type of the object to a dictionary which maps
+# (class, attribute name) to the attribute (or None if there is no such attribute)
+_super_attributes_by_type: "weakref.WeakKeyDictionary[type, Dict[Tuple[type, str], Optional[Any]]]" = weakref.WeakKeyDictionary()
+
+
+def _get_super_method(cls, obj, name: str) -> Optional[Callable]:
+    """
+    Gets the method with the given name that would be found via `super(cls, obj)`, resolving the method only once
+    for each combination of class and object type
+
+    :param cls: the class whose super-class implementation is to be found
+    :param obj: the instance of cls
+    :param name: the method name
+    :return: the bound method or None if no super-class of cls defines it
+    """
+    obj_type = type(obj)
+    super_attributes = _super_attributes_by_type.get(obj_type)
+    if super_attributes is None:
+        super_attributes = _super_attributes_by_type[obj_type] = {}
+    key = (cls, name)
+    if key in super_attributes:
+        attr = super_attributes[key]
+    else:
+        attr = None
+        mro = obj_type.__mro__
+        for c in mro[mro.index(cls) + 1:]:
+            if name in c.__dict__:
+                attr = c.__dict__[name]
+                break
+        super_attributes[key] = attr
+    if attr is None:
+        return None
+    return attr.__get__(obj, obj_type)
+
+
 def setstate(
     cls,
     obj,
@@ -193,9 +247,9 @@ def setstate(
             if p in state:
                 del state[p]
     # call super implementation, if any
-    s = super(cls, obj)
-    if hasattr(s, '__setstate__'):
-        s.__setstate__(state)
+    super_setstate = _get_super_method(cls, obj, "__setstate__")
+    if super_setstate is not None:
+        super_setstate(state)
     else:
         obj.__dict__ = state
 
@@ -224,9 +278,9 @@ def getstate(
         to the given default value
     :return: the state dictionary, which may be modified by the receiver
     """
-    s = super(cls, obj)
-    if hasattr(s, '__getstate__'):
-        d = s.__getstate__()
+    super_getstate = _get_super_method(cls, obj, "__getstate__")
+    if super_getstate is not None:
+        d = super_getstate()
     else:
         d = obj.__dict__.copy()
     if transient_properties is not None:
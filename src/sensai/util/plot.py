@@ -102,7 +102,10 @@ def plot_matrix(matrix: np.ndarray, title: str, xtick_labels: Sequence[str], yti
         title += f"\n {title_add} "
 
     if normalize:
-        matrix = matrix.astype('float') / matrix.sum()
+        # NOTE: the division creates a new (float64) array anyway, so we need to convert only floats of lower precision
+        if matrix.dtype.kind == 'f' and matrix.dtype != np.float64:
+            matrix = matrix.astype(np.float64)
+        matrix = matrix / matrix.sum()
     fig, ax = plt.subplots(figsize=figsize)
     fig.canvas.manager.set_window_title(title.replace("\n", " "))
     # We want to show all ticks...
@@ -121,13 +124,12 @@ def plot_matrix(matrix: np.ndarray, title: str, xtick_labels: Sequence[str], yti
         rotation_mode="anchor")
 
     # Loop over data dimensions and create text annotations.
-    fmt = '.4f' if normalize else ('.2f' if matrix.dtype.kind == 'f' else 'd')
-    thresh = matrix.max() / 2.
-    for i in range(matrix.shape[0]):
-        for j in range(matrix.shape[1]):
-            ax.text(j, i, format(matrix[i, j], fmt),
-                ha="center", va="center",
-                color="white" if matrix[i, j] > thresh else "black")
+    fmt = '%.4f' if normalize else ('%.2f' if matrix.dtype.kind == 'f' else '%d')
+    texts = np.char.mod(fmt, matrix)
+    is_above_thresh = matrix > matrix.max() / 2.
+    add_text = ax.text
+    for (i, j), text in np.ndenumerate(texts):
+        add_text(j, i, text, ha="center", va="center", color="white" if is_above_thresh[i, j] else "black")
     fig.tight_layout()
     return fig
 
@@ -141,9 +143,10 @@ class Plot:
         :param draw: function which returns a matplotlib.Axes object to show
         :param name: name/number of the figure, which determines the window caption; it should be unique, as any plot
             with the same name will have its contents rendered in the same window. By default, figures are number
-            sequentially.
+            sequentially. If a figure with the given name already exists, it is cleared and reused.
         """
-        fig, ax = plt.subplots(num=name)
+        # NOTE: pyplot already manages existing figures by name; clearing a reused figure avoids adding the new axes on top of the old ones
+        fig, ax = plt.subplots(num=name, clear=name is not None)
         self.fig: plt.Figure = fig
         self.ax: plt.Axes = ax
         if draw is not None:
@@ -275,14 +278,16 @@ class HeatMapPlot(Plot):
 
         def draw():
             nonlocal cmap
-            x_range = [min(x), max(x)]
-            y_range = [min(y), max(y)]
+            x_values = np.asarray(x)
+            y_values = np.asarray(y)
+            x_range = [x_values.min(), x_values.max()]
+            y_range = [y_values.min(), y_values.max()]
             rng = [min(x_range[0], y_range[0]), max(x_range[1], y_range[1])]
             if common_range:
                 x_range = y_range = rng
             if diagonal:
                 plt.plot(rng, rng, '-', lw=0.75, label="_not in legend", color=diagonal_color, zorder=2)
-            heatmap, _, _ = np.histogram2d(x, y, range=[x_range, y_range], bins=bins, density=False)
+            heatmap, _, _ = np.histogram2d(x_values, y_values, range=[x_range, y_range], bins=bins, density=False)
             extent = [x_range[0], x_range[1], y_range[0], y_range[1]]
             if cmap is None:
                 cmap = HeatMapPlot.DEFAULT_CMAP_FACTORY(len(x))
@@ -7,7 +7,7 @@ models. Hence the name of the module and of the central base class :class:`Vecto
 import logging
 import typing
 from abc import ABC, abstractmethod
-from typing import List, Any, Optional, Union, Type, Dict
+from typing import List, Any, Optional, Union, Type, Dict, Tuple
 
 import numpy as np
 import pandas as pd
@@ -232,6 +232,42 @@ class VectorModel(VectorModelFittableBase, PickleLoadSaveMixin, ABC):
             self._featureGenerator = feature_collector.get_multi_feature_generator()
         return self
 
+    def has_input_preprocessors(self) -> bool:
+        """
+        :return: True if the model uses any input preprocessors (raw input transformers, a feature generator or feature transformers)
+        """
+        return len(self._rawInputTransformerChain) > 0 or self._featureGenerator is not None or len(self._featureTransformerChain) > 0
+
+    def get_input_preprocessing_description(self) -> str:
+        """
+        :return: a description of the configuration of the model's input preprocessors (raw input transformers, feature generator and
+            feature transformers) and of further aspects of the model which affect how they are fitted; two models with the same
+            description are assumed to fit their input preprocessors identically when given the same data
+        """
+        return f"rawInputTransformers={self._rawInputTransformerChain}, featureGenerator={self._featureGenerator}, " \
+            f"featureTransformers={self._featureTransformerChain}"
+
+    def get_input_preprocessors(self) -> Tuple[DataFrameTransformerChain, Optional[FeatureGenerator], DataFrameTransformerChain]:
+        """
+        :return: a triple (raw input transformer chain, feature generator, feature transformer chain) containing the model's
+            input preprocessors
+        """
+        return self._rawInputTransformerChain, self._featureGenerator, self._featureTransformerChain
+
+    def set_input_preprocessors(self, raw_input_transformer_chain: DataFrameTransformerChain, feature_generator: Optional[FeatureGenerator],
+            feature_transformer_chain: DataFrameTransformerChain):
+        """
+        Sets the model's input preprocessors, e.g. in order to use preprocessors which have already been fitted
+        (see :meth:`get_input_preprocessors`)
+
+        :param raw_input_transformer_chain: the raw input transformer chain
+        :param feature_generator: the feature generator (if any)
+        :param feature_transformer_chain: the feature transformer chain
+        """
+        self._rawInputTransformerChain = raw_input_transformer_chain
+        self._featureGenerator = feature_generator
+        self._featureTransformerChain = feature_transformer_chain
+
     def _pre_processors_are_fitted(self):
         result = self._rawInputTransformerChain.is_fitted() and self._featureTransformerChain.is_fitted()
         if self.get_feature_generator() is not None:
@@ -524,6 +560,10 @@ class VectorRegressionModel(VectorModel, ABC):
     def is_regression_model(self) -> bool:
         return True
 
+    def get_input_preprocessing_description(self) -> str:
+        # the target transformer is relevant, as it transforms the outputs which may be used to fit the feature generator
+        return f"{super().get_input_preprocessing_description()}, targetTransformer={self._targetTransformer}"
+
     def with_output_transformers(self: TVectorRegressionModel,
             *output_transformers: Union[DataFrameTransformer, List[DataFrameTransformer]]) -> TVectorRegressionModel:
         """
@@ -673,8 +713,9 @@ class VectorClassificationModel(VectorModel, ABC):
             raise ValueError(f"Expected data frame with columns {labels}, got {df_cols}")
         y_array = df.values
         max_indices = np.argmax(y_array, axis=1)
-        result = [df_cols[i] for i in max_indices]
-        return pd.DataFrame(result, columns=self.get_predicted_variable_names())
+        # look up the labels via an object array (rather than per element), letting pandas infer the resulting column type
+        result = np.array(df_cols, dtype=object)[max_indices]
+        return pd.DataFrame(result, columns=self.get_predicted_variable_names()).infer_objects()
 
     def predict_class_probabilities(self, x: pd.DataFrame) -> pd.DataFrame:
         """
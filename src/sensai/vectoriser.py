@@ -1,9 +1,12 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
+import itertools
 import logging
 from typing import Callable, Union, TypeVar, Generic, Sequence, List, Tuple, Iterable, Dict, Hashable, Optional
 
 import numpy as np
+from sklearn.preprocessing import MaxAbsScaler, StandardScaler
 
 from .util import LogTime
 from .util.pickle import setstate
@@ -14,6 +17,37 @@ T = TypeVar("T")
 log = logging.getLogger(__name__)
 
 
+def _transform_vector(transformer, value: np.ndarray) -> np.ndarray:
+    """
+    Applies the given (fitted) transformer to a single vector.
+    For common scalers, the transformation is computed directly (avoiding the overhead of the transformer's input validation,
+    which dominates for single vectors); other transformers are applied to a batch containing the vector.
+
+    :param transformer: the transformer
+    :param value: the vector
+    :return: the transformed vector
+    """
+    transformer_type = type(transformer)
+    if transformer_type in (StandardScaler, MaxAbsScaler) and (value.dtype == np.float64 or value.dtype.kind in "iu"):
+        # the fitted attributes are absent if the transformer has not been fitted, in which case we fall back to transform,
+        # which raises the appropriate NotFittedError
+        fitted_array = getattr(transformer, "scale_", None)
+        if fitted_array is None:
+            fitted_array = getattr(transformer, "mean_", None)
+        if fitted_array is None or value.shape != fitted_array.shape:
+            return transformer.transform([value])[0]
+        value = value.astype(np.float64)
+        if transformer_type is StandardScaler:
+            if transformer.with_mean:
+                value -= transformer.mean_
+            if transformer.with_std:
+                value /= transformer.scale_
+        else:
+            value /= transformer.scale_
+        return value
+    return transformer.transform([value])[0]
+
+
 class Vectoriser(Generic[T], ToStringMixin):
     """
     A vectoriser represents a method for the conversion of instances of some type T into
@@ -67,17 +101,24 @@ class Vectoriser(Generic[T], ToStringMixin):
         self._is_fitted = True
 
     def _f(self, x) -> np.array:
-        y = self._fn(x)
-
-        if self._resultType is None:
-            self._resultType = self.ResultType.from_value(y)
-
-        if self._resultType == self.ResultType.LIST:
-            y = np.array(y)
-        elif self._resultType == self.ResultType.SCALAR:
-            y = np.array([y])
+        return self._to_vector(self._fn(x))
 
-        return y
+    def _to_vector(self, y) -> np.array:
+        """
+        :param y: a value returned by the function given at construction
+        :return: the corresponding vector
+        """
+        result_type = self._resultType
+        if result_type is None:
+            result_type = self._resultType = self.ResultType.from_value(y)
+
+        # NOTE: enum items are singletons, so we can use identity checks, handling the most common case (arrays) first
+        if result_type is _RESULT_TYPE_NUMPY_ARRAY:
+            return y
+        elif result_type is _RESULT_TYPE_LIST:
+            return np.array(y)
+        else:
+            return np.array([y])
 
     def apply(self, item: T, transform=True) -> np.array:
         """
@@ -87,10 +128,11 @@ class Vectoriser(Generic[T], ToStringMixin):
         """
         value = self._f(item)
         if self.transformer is not None and transform:
-            value = self.transformer.transform([value])[0]
+            value = _transform_vector(self.transformer, value)
         return value
 
-    def apply_multi(self, items: Iterable[T], transform=True, use_cache=False, verbose=False) -> List[np.array]:
+    def apply_multi(self, items: Iterable[T], transform=True, use_cache=False, verbose=False, num_processes: int = 1) \
+            -> List[np.array]:
         """
         Applies this vectoriser to multiple items at once.
         Especially for cases where this vectoriser uses a transformer, this method is significantly faster than
@@ -102,30 +144,55 @@ class Vectoriser(Generic[T], ToStringMixin):
             each input object id), which can significantly speed up computation in cases where an items appears more than
             once in the collection of items
         :param verbose: whether to generate log messages
+        :param num_processes: the number of parallel processes in which to apply the value function f given at construction
+            (use 1 to apply it sequentially in the current process). Parallelisation is worthwhile only if f is expensive to compute;
+            f and the items must be picklable.
         :return: a list of vectors
         """
         if verbose:
             self.log.info(f"Applying {self}")
 
         with LogTime("Application", enabled=verbose, logger=self.log):
-            if not use_cache:
-                compute_value = self._f
+            if num_processes != 1:
+                values = self._compute_values_in_parallel(items, use_cache, num_processes)
             else:
-                cache = {}
-
-                def compute_value(x):
-                    key = id(x)
-                    value = cache.get(key)
-                    if value is None:
-                        value = self._f(x)
-                        cache[key] = value
-                    return value
-
-            values = [compute_value(x) for x in items]
+                if not use_cache:
+                    compute_value = self._f
+                else:
+                    cache = {}
+
+                    def compute_value(x):
+                        key = id(x)
+                        value = cache.get(key)
+                        if value is None:
+                            value = self._f(x)
+                            cache[key] = value
+                        return value
+
+                values = [compute_value(x) for x in items]
             if self.transformer is not None and transform:
                 values = self.transformer.transform(values)
             return values
 
+    def _compute_values_in_parallel(self, items: Iterable[T], use_cache: bool, num_processes: int) -> List[np.array]:
+        items = list(items)
+        if use_cache:
+            # apply the function only to the unique items (in terms of object identity)
+            unique_items_by_id = {id(x): x for x in items}
+            unique_ids = list(unique_items_by_id.keys())
+            unique_items = list(unique_items_by_id.values())
+        else:
+            unique_ids = None
+            unique_items = items
+        # submit the items in chunks in order to reduce the communication overhead (with a few chunks per process for load balancing)
+        chunk_size = max(1, len(unique_items) // (4 * num_processes))
+        with ProcessPoolExecutor(max_workers=num_processes) as executor:
+            values = [self._to_vector(y) for y in executor.map(self._fn, unique_items, chunksize=chunk_size)]
+        if use_cache:
+            value_by_id = dict(zip(unique_ids, values))
+            values = [value_by_id[id(x)] for x in items]
+        return values
+
     class ResultType(Enum):
         SCALAR = 0
         LIST = 1
@@ -143,6 +210,10 @@ class Vectoriser(Generic[T], ToStringMixin):
                 raise ValueError(f"Received unhandled value of type {type(y)}")
 
 
+_RESULT_TYPE_NUMPY_ARRAY = Vectoriser.ResultType.NUMPY_ARRAY
+_RESULT_TYPE_LIST = Vectoriser.ResultType.LIST
+
+
 class EmptyVectoriser(Vectoriser):
     def __init__(self):
         super().__init__(self._create_empty_vector)
@@ -162,6 +233,15 @@ class ItemIdentifierProvider(Generic[T], ABC):
         pass
 
 
+class ItemIdentifierProviderObjectId(ItemIdentifierProvider[T]):
+    """
+    Identifies sequence items by their Python object identity, which avoids the (potentially expensive) hashing of the items
+    themselves
+    """
+    def get_identifier(self, item: T) -> Hashable:
+        return id(item)
+
+
 class SequenceVectoriser(Generic[T], ToStringMixin):
     """
     Supports the application of Vectorisers to sequences of objects of some type T, where each object of type T is
@@ -193,8 +273,9 @@ class SequenceVectoriser(Generic[T], ToStringMixin):
             the order the vectorisers are given.
         :param fitting_mode: the fitting mode for vectorisers. If `NONE`, no fitting takes place.
             If `UNIQUE`, fit vectorisers on unique set of items of type T. By default, uniqueness is determined based
-            on Python object identity. If a custom mechanisms for determining an item's identity is desired,
-            pass `unique_id_retriever`.
+            on the items' hashes and equality. If a custom mechanism for determining an item's identity is desired,
+            pass `unique_id_provider` (e.g. :class:`ItemIdentifierProviderObjectId` to use Python object identity, which avoids
+            hashing the items).
             If `CONCAT`, fit vectorisers based on all items of type T, concatenating them to a single sequence.
         :param unique_id_provider: an object used to determine item identities when using fitting mode `UNIQUE`.
         :param refit_vectorisers: whether any vectorisers that have previously been fitted shall be
@@ -220,7 +301,8 @@ class SequenceVectoriser(Generic[T], ToStringMixin):
             new_default_properties={"refitVectorisers": True})
 
     def fit(self, data: Iterable[Sequence[T]]):
-        log.debug(f"Fitting {self}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(f"Fitting {self}")
 
         if self.fittingMode == self.FittingMode.NONE:
             return
@@ -233,18 +315,16 @@ class SequenceVectoriser(Generic[T], ToStringMixin):
         # obtain items for fitting
         if self.fittingMode == self.FittingMode.UNIQUE:
             if self.uniqueIdProvider is None:
-                items = set()
-                for seq in data:
-                    items.update(seq)
+                items = set(itertools.chain.from_iterable(data))
             else:
                 items = []
                 identifiers = set()
-                for seq in data:
-                    for item in seq:
-                        identifier = self.uniqueIdProvider.get_identifier(item)
-                        if identifier not in identifiers:
-                            identifiers.add(identifier)
-                            items.append(item)
+                get_identifier = self.uniqueIdProvider.get_identifier
+                for item in itertools.chain.from_iterable(data):
+                    identifier = get_identifier(item)
+                    if identifier not in identifiers:
+                        identifiers.add(identifier)
+                        items.append(item)
         elif self.fittingMode == self.FittingMode.CONCAT:
             items = np.concatenate(data)  # type: ignore
         else:
@@ -270,7 +350,8 @@ class SequenceVectoriser(Generic[T], ToStringMixin):
             vectors_list.append(conc)
         return vectors_list
 
-    def apply_multi(self, sequences: Iterable[Sequence[T]], use_cache=False, verbose=False) -> Tuple[List[List[np.array]], List[int]]:
+    def apply_multi(self, sequences: Iterable[Sequence[T]], use_cache=False, verbose=False, num_processes: int = 1) \
+            -> Tuple[List[List[np.array]], List[int]]:
         """
         Applies this vectoriser to multiple sequences of objects of type T, where each sequence is mapped to a sequence
         of 1D arrays.
@@ -282,9 +363,26 @@ class SequenceVectoriser(Generic[T], ToStringMixin):
             each input object id), which can significantly speed up computation in cases where the given sequences contain individual
             items more than once
         :param verbose: whether to generate log messages
+        :param num_processes: the number of parallel processes in which to apply the value functions of contained vectorisers
+            (see :meth:`Vectoriser.apply_multi`)
         :return: a pair (vl, l) where vl is a list of lists of vectors/arrays and l is a list of integers containing the lengths
             of the sequences
         """
+        vector_matrix, lengths = self._apply_multi_to_matrix(sequences, use_cache=use_cache, verbose=verbose,
+            num_processes=num_processes)
+        conc_vectors = list(vector_matrix)
+        idx_ends = np.cumsum(lengths).tolist()
+        vector_sequences = [conc_vectors[idx_end-l:idx_end] for l, idx_end in zip(lengths, idx_ends)]
+        return vector_sequences, lengths
+
+    def _apply_multi_to_matrix(self, sequences: Iterable[Sequence[T]], use_cache=False, verbose=False, num_processes: int = 1) \
+            -> Tuple[np.ndarray, List[int]]:
+        """
+        Applies this vectoriser to the items of multiple sequences (see :meth:`apply_multi`)
+
+        :return: a pair (m, l) where m is a 2D array containing the vectors of all the sequences' items (in order) as rows and l is
+            a list of integers containing the lengths of the sequences
+        """
         if verbose:
             self.log.info(f"Applying {self} (useCache={use_cache})")
 
@@ -292,23 +390,16 @@ class SequenceVectoriser(Generic[T], ToStringMixin):
 
         if verbose:
             self.log.info("Generating combined sequence")
-        combined_seq = []
-        for seq in sequences:
-            combined_seq.extend(seq)
-
-        individual_vectoriser_results = [vectoriser.apply_multi(combined_seq, use_cache=use_cache, verbose=verbose)
-            for vectoriser in self.vectorisers]
-        conc_vectors = [np.concatenate(x, axis=0) for x in zip(*individual_vectoriser_results)]
+        combined_seq = list(itertools.chain.from_iterable(sequences))
 
-        vector_sequences = []
-        idx_start = 0
-        for l in lengths:
-            vector_sequences.append(conc_vectors[idx_start:idx_start+l])
-            idx_start += l
+        # each vectoriser yields a block of shape (number of items, vectoriser dimension); the blocks are combined horizontally
+        blocks = []
+        for vectoriser in self.vectorisers:
+            values = vectoriser.apply_multi(combined_seq, use_cache=use_cache, verbose=verbose, num_processes=num_processes)
+            blocks.append(np.asarray(values).reshape(len(combined_seq), -1) if len(combined_seq) > 0 else np.zeros((0, 0)))
+        return np.hstack(blocks), lengths
 
-        return vector_sequences, lengths
-
-    def apply_multi_with_padding(self, sequences: Sequence[Sequence[T]], use_cache=False, verbose=False) \
+    def apply_multi_with_padding(self, sequences: Sequence[Sequence[T]], use_cache=False, verbose=False, num_processes: int = 1) \
             -> Tuple[List[List[np.array]], List[int]]:
         """
         Applies this vectoriser to multiple sequences of objects of type T, where each sequence is mapped to a sequence
@@ -321,10 +412,13 @@ class SequenceVectoriser(Generic[T], ToStringMixin):
             each input object id), which can significantly speed up computation in cases where the given sequences contain individual
             items more than once
         :param verbose: whether to generate log messages
+        :param num_processes: the number of parallel processes in which to apply the value functions of contained vectorisers
+            (see :meth:`Vectoriser.apply_multi`)
         :return: a pair (vl, l) where vl is a list of lists of vectors/arrays, each list having the same length, and l is a list of
             integers containing the original unpadded lengths of the sequences
         """
-        result, lengths = self.apply_multi(sequences, use_cache=use_cache, verbose=verbose)
+        result, lengths = self.apply_multi(sequences, use_cache=use_cache, verbose=verbose,
+            num_processes=num_processes)
         if verbose:
             self.log.info("Applying padding")
         max_length = max(lengths)
@@ -335,6 +429,36 @@ class SequenceVectoriser(Generic[T], ToStringMixin):
                 seq.append(dummy_vec)
         return result, lengths
 
+    def apply_multi_with_padding_array(self, sequences: Sequence[Sequence[T]], use_cache=False, verbose=False,
+            num_processes: int = 1) \
+            -> Tuple[np.ndarray, List[int]]:
+        """
+        Applies this vectoriser to multiple sequences of objects of type T, generating a single 3D array containing the
+        (padded) sequences of vectors (see :meth:`apply_multi_with_padding`).
+        This is more efficient than :meth:`apply_multi_with_padding` if the result is to be converted to an array/tensor anyway.
+
+        :param sequences: the sequences to vectorise
+        :param use_cache: whether to apply caching of the value functions of contained vectorisers (keeping track of outputs for
+            each input object id), which can significantly speed up computation in cases where the given sequences contain individual
+            items more than once
+        :param verbose: whether to generate log messages
+        :param num_processes: the number of parallel processes in which to apply the value functions of contained vectorisers
+            (see :meth:`Vectoriser.apply_multi`)
+        :return: a pair (a, l) where a is an array of shape (number of sequences, maximum sequence length, vector dimension),
+            in which shorter sequences are padded with 0-vectors, and l is a list of integers containing the original unpadded lengths
+            of the sequences
+        """
+        vector_matrix, lengths = self._apply_multi_to_matrix(sequences, use_cache=use_cache, verbose=verbose,
+            num_processes=num_processes)
+        if verbose:
+            self.log.info("Applying padding")
+        max_length = max(lengths)
+        result = np.zeros((len(lengths), max_length, vector_matrix.shape[1]))
+        # fill all sequences at once: the (row-major) order of the masked positions corresponds to the order of the vectors
+        is_within_sequence = np.arange(max_length) < np.array(lengths)[:, np.newaxis]
+        result[is_within_sequence] = vector_matrix
+        return result, lengths
+
     def get_vector_dim(self, seq: Sequence[T]):
         """
         Determines the dimensionality of generated vectors by applying the vectoriser to the given sequence
@@ -368,16 +492,15 @@ class VectoriserRegistry:
         :param factory: the factory, which takes the default transformer factory as an argument
         :param additional_names: (optional) additional names under which to register the factory
         """
-        self._register_factory(name, factory)
+        names = [self._name(name)]
         if additional_names is not None:
-            for n in additional_names:
-                self._register_factory(n, factory)
-
-    def _register_factory(self, name: Hashable, factory):
-        name = self._name(name)
-        if name in self._factories:
-            raise ValueError(f"Vectoriser factory for name '{name}' already registered")
-        self._factories[name] = factory
+            names.extend(self._name(n) for n in additional_names)
+        # check all names before registering any of them, such that a failed registration leaves the registry unchanged
+        new_factories = dict.fromkeys(names, factory)
+        if len(new_factories) < len(names) or not new_factories.keys().isdisjoint(self._factories):
+            already_registered_name = next(n for i, n in enumerate(names) if n in self._factories or n in names[:i])
+            raise ValueError(f"Vectoriser factory for name '{already_registered_name}' already registered")
+        self._factories.update(new_factories)
 
     def get_vectoriser(self, name: Hashable, default_transformer_factory: Callable) -> Vectoriser:
         """
@@ -1,5 +1,7 @@
+from abc import ABC
 from typing import Optional
 
+import pandas as pd
 import xgboost
 
 from .sklearn.sklearn_base import AbstractSkLearnMultipleOneDimVectorRegressionModel, AbstractSkLearnVectorClassificationModel, \
@@ -18,7 +20,36 @@ def is_xgboost_version_at_least(major: int, minor: Optional[int] = None, patch:
     return True
 
 
-class XGBGradientBoostedVectorRegressionModel(AbstractSkLearnMultipleOneDimVectorRegressionModel,
+class AbstractXGBMultipleOneDimVectorRegressionModel(AbstractSkLearnMultipleOneDimVectorRegressionModel, ABC):
+    """
+    Base class for XGBoost regression models with one underlying model per output dimension, which converts the inputs
+    to a single DMatrix that is shared by all underlying models at prediction time (rather than having each model's
+    predict method convert the same inputs anew)
+    """
+    def _can_share_dmatrix(self) -> bool:
+        for model in self.models.values():
+            # models wrapped in an output transformer as well as models using categorical features require the regular predict path
+            if not isinstance(model, xgboost.XGBModel) or getattr(model, "enable_categorical", False):
+                return False
+            # the iteration range used by the model's own predict method must be available (xgboost >= 1.4)
+            if not hasattr(model, "_get_iteration_range"):
+                return False
+        return True
+
+    def _predict_sklearn(self, inputs: pd.DataFrame) -> pd.DataFrame:
+        if len(self.models) < 2 or not self._can_share_dmatrix():
+            return super()._predict_sklearn(inputs)
+        first_model = next(iter(self.models.values()))
+        dmatrix = xgboost.DMatrix(inputs, missing=first_model.missing, nthread=first_model.n_jobs)
+        results = {}
+        for varName, model in self.models.items():
+            # use the same iteration range as the model's predict method (which takes early stopping into account)
+            iteration_range = model._get_iteration_range(None)
+            results[varName] = model.get_booster().predict(dmatrix, iteration_range=iteration_range, validate_features=False)
+        return pd.DataFrame(results)
+
+
+class XGBGradientBoostedVectorRegressionModel(AbstractXGBMultipleOneDimVectorRegressionModel,
         FeatureImportanceProviderSkLearnRegressionMultipleOneDim):
     """
     XGBoost's regression model using gradient boosted trees
@@ -30,7 +61,7 @@ class XGBGradientBoostedVectorRegressionModel(AbstractSkLearnMultipleOneDimVecto
         super().__init__(xgboost.XGBRegressor, random_state=random_state, **model_args)
 
 
-class XGBRandomForestVectorRegressionModel(AbstractSkLearnMultipleOneDimVectorRegressionModel,
+class XGBRandomForestVectorRegressionModel(AbstractXGBMultipleOneDimVectorRegressionModel,
         FeatureImportanceProviderSkLearnRegressionMultipleOneDim):
     """
     XGBoost's random forest regression model
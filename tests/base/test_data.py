@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import scipy.stats
+
+from sensai import InputOutputData
+
+
+def test_compute_input_output_correlation():
+    rng = np.random.default_rng(42)
+    inputs = pd.DataFrame(rng.normal(size=(100, 3)), columns=["a", "b", "c"])
+    inputs["const"] = 1.0
+    outputs = pd.DataFrame({"y": 2 * inputs["a"] + rng.normal(size=100), "z": rng.normal(size=100)})
+    correlations = InputOutputData(inputs, outputs).compute_input_output_correlation()
+    assert set(correlations.keys()) == {"y", "z"}
+    for output_col in outputs.columns:
+        for input_col in ["a", "b", "c"]:
+            expected = scipy.stats.pearsonr(inputs[input_col], outputs[output_col])[0]
+            assert np.isclose(correlations[output_col][input_col], expected)
+        assert np.isnan(correlations[output_col]["const"])
+
+
+def test_compute_input_output_correlation_cache():
+    rng = np.random.default_rng(42)
+    io_data = InputOutputData(pd.DataFrame(rng.normal(size=(50, 2)), columns=["a", "b"]), pd.DataFrame({"y": rng.normal(size=50)}))
+    correlations = io_data.compute_input_output_correlation()
+    assert io_data._standardisedArrays is None
+    assert io_data.compute_input_output_correlation(cache=True) == correlations
+    assert io_data._standardisedArrays is not None
+    assert io_data.compute_input_output_correlation() == correlations
+    io_data.clear_correlation_cache()
+    assert io_data._standardisedArrays is None
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from sensai.evaluation.eval_stats.eval_stats_classification import ClassificationEvalStats, BinaryClassificationMetricPrecision
+from sensai.evaluation.eval_stats.eval_stats_regression import RegressionEvalStats, RegressionEvalStatsCollection
+
+
+def test_classification_eval_stats_add_invalidates_caches():
+    eval_stats = ClassificationEvalStats(y_predicted=["a", "a", "b"], y_true=["a", "b", "b"], labels=["a", "b"],
+        binary_positive_label=None)
+    eval_stats.metrics_dict()
+    eval_stats.get_confusion_matrix()
+    eval_stats.add("a", "a")
+    eval_stats.add("a", "a")
+    assert np.array_equal(eval_stats.get_confusion_matrix().confusionMatrix, [[3, 0], [1, 1]])
+    assert np.isclose(eval_stats.metrics_dict()["accuracy"], 0.8)
+
+
+def test_classification_eval_stats_add_invalidates_label_codes():
+    eval_stats = ClassificationEvalStats(y_predicted=["a", "b"], y_true=["a", "b"], labels=["a", "b"], binary_positive_label="a")
+    assert eval_stats.get_positive_ground_truth_mask().tolist() == [True, False]
+    eval_stats.add("b", "a")
+    assert eval_stats.get_positive_ground_truth_mask().tolist() == [True, False, True]
+
+
+def test_eval_stats_collection_agg_metrics_dict_custom_function():
+    collection = RegressionEvalStatsCollection([RegressionEvalStats(y_predicted=[1.0, 2.0], y_true=[1.0, 3.0]),
+        RegressionEvalStats(y_predicted=[1.0, 2.0], y_true=[2.0, 2.0])])
+    agg = collection.agg_metrics_dict(agg_fns=(np.mean, lambda values: max(values) - min(values)))
+    assert np.isclose(agg["mean[MAE]"], 0.5)
+    assert np.isclose(agg["<lambda>[MAE]"], 0.0)
+
+
+def test_binary_classification_metric_label_validation():
+    metric = BinaryClassificationMetricPrecision("a")
+    assert metric.compute_value(["a", "b", "b"], ["a", "a", "b"]) == 0.5
+    with pytest.raises(ValueError):
+        metric.compute_value(["a", "b", "c"], ["a", "b", "c"])
+    with pytest.raises(ValueError):
+        BinaryClassificationMetricPrecision("x").compute_value(["a", "b"], ["a", "b"])
+    eval_stats = ClassificationEvalStats(y_predicted=["a", "b", "c"], y_true=["a", "b", "c"], labels=["a", "b", "c"],
+        binary_positive_label=None)
+    with pytest.raises(ValueError):
+        eval_stats.compute_metric_value(metric)
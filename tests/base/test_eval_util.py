@@ -0,0 +1,156 @@
+import pandas as pd
+import pytest
+
+from sensai.data import InputOutputData
+from sensai.evaluation.crossval import VectorModelCrossValidatorParams
+from sensai.evaluation.eval_util import ClassificationModelEvaluation, MultiDataModelEvaluation
+from sensai.evaluation.evaluator import ClassificationEvaluatorParams, VectorClassificationModelEvaluator
+from sensai.featuregen import FeatureGenerator
+from sensai.sklearn.sklearn_classification import SkLearnLogisticRegressionVectorClassificationModel, \
+    SkLearnDecisionTreeVectorClassificationModel
+
+
+class FitCountingFeatureGenerator(FeatureGenerator):
+    num_fits = 0
+
+    def __init__(self):
+        super().__init__()
+        # an explicit name is required for the preprocessing configurations of different instances to be equal
+        self.set_name("fitCounter")
+
+    def _fit(self, x: pd.DataFrame, y: pd.DataFrame = None, ctx=None):
+        FitCountingFeatureGenerator.num_fits += 1
+
+    def _generate(self, df: pd.DataFrame, ctx=None) -> pd.DataFrame:
+        return df
+
+
+def create_log_reg_model():
+    return SkLearnLogisticRegressionVectorClassificationModel(max_iter=500).with_name("logReg")
+
+
+def create_decision_tree_model():
+    return SkLearnDecisionTreeVectorClassificationModel(random_state=42).with_name("decisionTree")
+
+
+def test_compare_models_evaluation_cache(irisDataSet, tmp_path):
+    ev = ClassificationModelEvaluation(irisDataSet.getInputOutputData(),
+        evaluator_params=ClassificationEvaluatorParams(fractional_split_test_fraction=0.3))
+    cache_dir = str(tmp_path)
+
+    def create_model(max_iter=500):
+        return SkLearnLogisticRegressionVectorClassificationModel(max_iter=max_iter).with_name("logReg")
+
+    results_df = ev.compare_models([create_model()], cache_dir=cache_dir).results_df
+
+    # an identically configured model is not evaluated again
+    model = create_model()
+    cached_results_df = ev.compare_models([model], cache_dir=cache_dir, cache_replay_only=True).results_df
+    assert cached_results_df.equals(results_df)
+    assert not model.is_fitted()
+
+    # a model with a different configuration is not served from the cache
+    with pytest.raises(Exception, match="No cached evaluation result"):
+        ev.compare_models([create_model(max_iter=600)], cache_dir=cache_dir, cache_replay_only=True)
+
+
+def test_data_hash_with_non_hashable_values(irisDataSet):
+    io_data = irisDataSet.getInputOutputData()
+    inputs = io_data.inputs.copy()
+    inputs["list_col"] = [[i] for i in range(len(inputs))]
+    ev = ClassificationModelEvaluation(InputOutputData(inputs, io_data.outputs))
+    data_hash = ev._get_data_hash()
+    assert ClassificationModelEvaluation(InputOutputData(inputs.copy(), io_data.outputs))._get_data_hash() == data_hash
+    inputs["list_col"] = [[i + 1] for i in range(len(inputs))]
+    assert ClassificationModelEvaluation(InputOutputData(inputs, io_data.outputs))._get_data_hash() != data_hash
+
+
+@pytest.mark.parametrize("use_cross_validation", [False, True])
+def test_compare_models_parallel(irisDataSet, use_cross_validation):
+    ev = ClassificationModelEvaluation(irisDataSet.getInputOutputData(),
+        evaluator_params=ClassificationEvaluatorParams(fractional_split_test_fraction=0.3),
+        cross_validator_params=VectorModelCrossValidatorParams(folds=3))
+    results_df = ev.compare_models([create_log_reg_model(), create_decision_tree_model()],
+        use_cross_validation=use_cross_validation).results_df
+    parallel_results_df = ev.compare_models([create_log_reg_model(), create_decision_tree_model()],
+        use_cross_validation=use_cross_validation, num_processes=2).results_df
+    assert parallel_results_df.equals(results_df)
+
+
+def test_cross_validation_parallel_folds(irisDataSet):
+    io_data = irisDataSet.getInputOutputData()
+    results_dfs = []
+    for num_processes in (1, 2):
+        ev = ClassificationModelEvaluation(io_data, cross_validator_params=VectorModelCrossValidatorParams(folds=3,
+            num_processes=num_processes))
+        results_dfs.append(ev.compare_models([create_log_reg_model()], use_cross_validation=True).results_df)
+    assert results_dfs[1].equals(results_dfs[0])
+
+
+def test_multi_data_compare_models_parallel(irisDataSet):
+    io_data = irisDataSet.getInputOutputData()
+    io_data_dict = {"first": io_data.filter_indices(list(range(0, 150, 2))), "second": io_data.filter_indices(list(range(1, 150, 2)))}
+    ev = MultiDataModelEvaluation(io_data_dict, evaluator_params=ClassificationEvaluatorParams(fractional_split_test_fraction=0.3))
+    model_factories = [create_log_reg_model, create_decision_tree_model]
+    results_df = ev.compare_models(model_factories, create_metric_distribution_plots=False).all_results_df
+    parallel_results_df = ev.compare_models(model_factories, create_metric_distribution_plots=False, num_processes=2).all_results_df
+    pd.testing.assert_frame_equal(parallel_results_df, results_df)
+
+
+def test_compare_models_input_preprocessor_sharing(irisDataSet):
+    ev = ClassificationModelEvaluation(irisDataSet.getInputOutputData(),
+        evaluator_params=ClassificationEvaluatorParams(fractional_split_test_fraction=0.3))
+
+    def create_models():
+        return [create_log_reg_model().with_feature_generator(FitCountingFeatureGenerator()),
+            create_decision_tree_model().with_feature_generator(FitCountingFeatureGenerator())]
+
+    FitCountingFeatureGenerator.num_fits = 0
+    results_df = ev.compare_models(create_models()).results_df
+    assert FitCountingFeatureGenerator.num_fits == 2
+    FitCountingFeatureGenerator.num_fits = 0
+    shared_results_df = ev.compare_models(create_models(), share_input_preprocessors=True).results_df
+    assert FitCountingFeatureGenerator.num_fits == 1
+    assert shared_results_df.equals(results_df)
+
+
+def test_compare_models_without_retained_predictions(irisDataSet):
+    ev = ClassificationModelEvaluation(irisDataSet.getInputOutputData(),
+        evaluator_params=ClassificationEvaluatorParams(fractional_split_test_fraction=0.3))
+    results_df = ev.compare_models([create_log_reg_model()]).results_df
+    comparison_data = ev.compare_models([create_log_reg_model()], retain_predictions=False)
+    assert comparison_data.results_df.equals(results_df)
+    eval_stats = comparison_data.result_by_model_name["logReg"].eval_data.get_eval_stats()
+    assert eval_stats.y_predicted is None
+    assert eval_stats.metrics_dict() == results_df.loc["logReg"].to_dict()
+
+
+def test_evaluator_split_cache(irisDataSet):
+    io_data = irisDataSet.getInputOutputData()
+    params = ClassificationEvaluatorParams(fractional_split_test_fraction=0.3)
+    evaluator = VectorClassificationModelEvaluator(io_data, params=params)
+    assert VectorClassificationModelEvaluator(io_data, params=params).test_data is evaluator.test_data
+    # replacing the data invalidates the cached split
+    io_data.outputs = io_data.outputs.copy()
+    test_data = VectorClassificationModelEvaluator(io_data, params=params).test_data
+    assert test_data is not evaluator.test_data
+    assert test_data.outputs.equals(evaluator.test_data.outputs)
+
+
+def test_evaluator_outputs_caching(irisDataSet, monkeypatch):
+    evaluator = VectorClassificationModelEvaluator(irisDataSet.getInputOutputData(),
+        params=ClassificationEvaluatorParams(fractional_split_test_fraction=0.3))
+    evaluator.set_outputs_caching(True)
+    model = create_log_reg_model()
+    evaluator.fit_model(model)
+    predict = model.predict
+    num_predict_calls = []
+    monkeypatch.setattr(model, "predict", lambda x: num_predict_calls.append(1) or predict(x))
+    predictions = evaluator.compute_test_data_outputs(model)[0]
+    eval_stats = evaluator.eval_model(model).get_eval_stats()
+    assert len(num_predict_calls) == 1
+    assert list(eval_stats.y_predicted) == list(predictions.iloc[:, 0])
+    # fitting the model again invalidates the cached outputs
+    evaluator.fit_model(model)
+    evaluator.eval_model(model)
+    assert len(num_predict_calls) == 2
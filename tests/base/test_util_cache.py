@@ -0,0 +1,18 @@
+import os
+
+from sensai.util.cache import SqlitePersistentKeyValueCache, InMemoryKeyValueCache
+
+
+def test_sqlite_cache_bulk_operations(tmpdir):
+    cache = SqlitePersistentKeyValueCache(os.path.join(tmpdir, "cache.sqlite"), deferred_commit_delay_secs=0.1)
+    cache.set("a", 1)
+    cache.set_many([("b", [2]), ("a", 3)] + [(f"key{i}", i) for i in range(1200)])
+    assert len(cache) == 1202
+    assert cache.get("a") == 3
+    assert cache.get_many(["b", "missing", "a", "key1199"]) == [[2], None, 3, 1199]
+
+
+def test_in_memory_cache_bulk_operations():
+    cache = InMemoryKeyValueCache()
+    cache.set_many({"a": 1, "b": 2}.items())
+    assert cache.get_many(["b", "c", "a"]) == [2, None, 1]
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+xgboost = pytest.importorskip("xgboost")
+
+from sensai.xgboost import XGBGradientBoostedVectorRegressionModel, XGBRandomForestVectorRegressionModel
+
+
+def _multi_output_data(n=300, seed=42):
+    rng = np.random.default_rng(seed)
+    inputs = pd.DataFrame(rng.normal(size=(n, 4)), columns=["a", "b", "c", "d"])
+    outputs = pd.DataFrame({
+        "y": inputs["a"] - 2 * inputs["b"] + rng.normal(size=n),
+        "z": inputs["c"] * inputs["d"] + rng.normal(size=n)})
+    return inputs, outputs
+
+
+def _assert_predictions_match_underlying_models(model, inputs: pd.DataFrame):
+    predictions = model.predict(inputs)
+    for var_name, sklearn_model in model.models.items():
+        assert np.allclose(predictions[var_name].values, sklearn_model.predict(inputs))
+
+
+@pytest.mark.parametrize("model_factory", [
+    lambda: XGBGradientBoostedVectorRegressionModel(n_estimators=50),
+    lambda: XGBRandomForestVectorRegressionModel(n_estimators=20)])
+def test_multi_output_predictions(model_factory):
+    inputs, outputs = _multi_output_data()
+    model = model_factory()
+    model.fit(inputs, outputs)
+    _assert_predictions_match_underlying_models(model, inputs)
+
+
+def test_multi_output_predictions_with_early_stopping():
+    inputs, outputs = _multi_output_data()
+    val_inputs, val_outputs = _multi_output_data(seed=1)
+    model = XGBGradientBoostedVectorRegressionModel(n_estimators=300, learning_rate=0.5)
+    model.fit(inputs, outputs)
+    # refit the underlying models with early stopping, using output-specific validation data
+    for var_name, sklearn_model in model.models.items():
+        sklearn_model.set_params(early_stopping_rounds=5)
+        sklearn_model.fit(inputs, outputs[var_name], eval_set=[(val_inputs, val_outputs[var_name])], verbose=False)
+        assert sklearn_model.best_iteration < 299
+    _assert_predictions_match_underlying_models(model, val_inputs)